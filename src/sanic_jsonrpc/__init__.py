@@ -1,17 +1,27 @@
+from ._middleware import Transports
+from .cache import *
+from .codecs import *
 from .errors import *
+from .executors import *
 from .jsonrpc import *
 from .loggers import *
+from .metrics import *
 from .models import *
 from .notifier import *
 from .types import *
 
 __all__ = [
+    *cache.__all__,
+    *codecs.__all__,
     *errors.__all__,
+    *executors.__all__,
     *jsonrpc.__all__,
     *loggers.__all__,
+    *metrics.__all__,
     *models.__all__,
     *notifier.__all__,
     *types.__all__,
+    'Transports',
 ]
 
 __version__ = '0.4.0'
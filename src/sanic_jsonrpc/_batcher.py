@@ -0,0 +1,55 @@
+from asyncio import Event, Future, TimeoutError, ensure_future, wait_for
+from typing import AnyStr, Awaitable, Callable, List, Optional, Tuple
+
+__all__ = [
+    'FrameBatcher',
+]
+
+
+class FrameBatcher:
+    __slots__ = ('_send', '_brackets', '_max_size', '_delay', '_buffer', '_full', '_task')
+
+    def __init__(
+            self,
+            send: Callable[[AnyStr], Awaitable],
+            brackets: Tuple[AnyStr, AnyStr, AnyStr],
+            max_size: int,
+            delay: float = 0
+    ):
+        self._send = send
+        self._brackets = brackets
+        self._max_size = max_size
+        self._delay = delay
+        self._buffer = None  # type: Optional[List[AnyStr]]
+        self._full = None  # type: Optional[Event]
+        self._task = None  # type: Optional[Future]
+
+    async def _flush(self, buffer: List[AnyStr], full: Event):
+        if self._delay:
+            try:
+                await wait_for(full.wait(), self._delay)
+            except TimeoutError:
+                pass
+
+        if self._buffer is buffer:
+            self._buffer = None
+
+        if len(buffer) == 1:
+            await self._send(buffer[0])
+        else:
+            opening, separator, closing = self._brackets
+            await self._send(opening + separator.join(buffer) + closing)
+
+    def add(self, data: AnyStr) -> Future:
+        if self._buffer is None:
+            self._buffer = []
+            self._full = Event()
+            self._task = ensure_future(self._flush(self._buffer, self._full))
+
+        self._buffer.append(data)
+
+        if len(self._buffer) >= self._max_size:
+            self._buffer = None
+            self._full.set()
+
+        return self._task
@@ -0,0 +1,110 @@
+from asyncio import AbstractEventLoop
+from os import getpid, listdir, makedirs, unlink
+from os.path import join
+from socket import AF_UNIX, SOCK_DGRAM, socket
+from time import monotonic
+from typing import Callable, List, Optional
+
+from .loggers import error_logger, logger
+
+__all__ = [
+    'Bus',
+]
+
+_SUFFIX = '.sock'
+_SEPARATOR = b'\0'
+# Stays below the default Linux datagram limit (net.core.wmem_default, 212992 bytes)
+_MAX_FRAME = 204800
+_REFRESH = 1.0
+
+_Handler = Callable[[str, bytes], None]
+
+
+class Bus:
+    __slots__ = ('path', '_handler', '_socket', '_address', '_loop', '_peers', '_refreshed')
+
+    def __init__(self, path: str, handler: _Handler):
+        self.path = path
+        self._handler = handler
+        self._socket = None  # type: Optional[socket]
+        self._address = None  # type: Optional[str]
+        self._loop = None  # type: Optional[AbstractEventLoop]
+        self._peers = []  # type: List[str]
+        self._refreshed = None  # type: Optional[float]
+
+    def open(self, loop: AbstractEventLoop):
+        makedirs(self.path, exist_ok=True)
+        self._address = join(self.path, '{}-{}{}'.format(getpid(), id(self), _SUFFIX))
+        self._socket = socket(AF_UNIX, SOCK_DGRAM)
+        self._socket.setblocking(False)
+        self._socket.bind(self._address)
+        self._loop = loop
+        self._refreshed = None
+        loop.add_reader(self._socket.fileno(), self._read)
+
+    def close(self):
+        if self._socket is None:
+            return
+
+        self._loop.remove_reader(self._socket.fileno())
+        self._socket.close()
+        self._socket = None
+
+        try:
+            unlink(self._address)
+        except FileNotFoundError:
+            pass
+
+    def _read(self):
+        while True:
+            try:
+                frame = self._socket.recv(_MAX_FRAME)
+            except (BlockingIOError, InterruptedError):
+                return
+
+            topic, _, data = frame.partition(_SEPARATOR)
+
+            try:
+                self._handler(topic.decode(), data)
+            except Exception as err:
+                error_logger.error("Bus delivery of %r failed: %s", topic, err, exc_info=err)
+
+    def _refresh(self) -> List[str]:
+        now = monotonic()
+
+        if self._refreshed is None or now - self._refreshed > _REFRESH:
+            self._peers = [
+                join(self.path, name)
+                for name in listdir(self.path)
+                if name.endswith(_SUFFIX) and join(self.path, name) != self._address
+            ]
+            self._refreshed = now
+
+        return self._peers
+
+    def publish(self, topic: str, data: bytes):
+        if self._socket is None:
+            return
+
+        frame = topic.encode() + _SEPARATOR + data
+
+        if len(frame) > _MAX_FRAME:
+            raise ValueError("Bus frame for {!r} is {} bytes, limit is {}".format(topic, len(frame), _MAX_FRAME))
+
+        for peer in self._refresh():
+            try:
+                self._socket.sendto(frame, peer)
+            except FileNotFoundError:
+                self._refreshed = None
+            except ConnectionRefusedError:
+                logger.info("Removing stale bus peer %r", peer)
+                self._refreshed = None
+
+                try:
+                    unlink(peer)
+                except FileNotFoundError:
+                    pass
+            except BlockingIOError:
+                logger.warning("Bus peer %r is not keeping up, dropped %r", peer, topic)
+            except OSError as err:
+                error_logger.error("Bus publish of %r to %r failed: %s", topic, peer, err)
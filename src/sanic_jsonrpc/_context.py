@@ -1,6 +1,8 @@
 from copy import copy
-from typing import Dict, Optional, Union
+from time import monotonic
+from typing import Dict, Optional, Tuple, Union
 
+from fashionable import Func
 from sanic import Sanic
 from sanic.request import Request as SanicRequest
 from websockets import WebSocketCommonProtocol as WebSocket
@@ -8,24 +10,51 @@ from websockets import WebSocketCommonProtocol as WebSocket
 from ._middleware import Directions, Objects, Transports
 from .models import Notification, Request, Response
 from .notifier import Notifier
-from .types import AnyJsonrpc, Incoming, Outgoing
+from .types import AnyJsonrpc, Incoming, Outgoing, Timings
 
 __all__ = [
     'Context',
     'ContextValue',
+    'Injections',
     'MutableContextValue',
 ]
 
 MutableContextValue = Union[AnyJsonrpc, Directions]
 ContextValue = Union[Sanic, SanicRequest, WebSocket, Notifier, Transports, Objects, MutableContextValue]
+Injections = Tuple[Tuple[type, str], ...]
+
+_SLOTS = {
+    Sanic: '_sanic',
+    SanicRequest: '_sanic_request',
+    Directions: '_direction',
+    Transports: '_transport',
+    Objects: '_object',
+    WebSocket: '_websocket', Optional[WebSocket]: '_websocket',
+    Notifier: '_notifier', Optional[Notifier]: '_notifier',
+    Request: '_request', Optional[Request]: '_request',
+    Response: '_response', Optional[Response]: '_response',
+    Notification: '_notification', Optional[Notification]: '_notification',
+    Incoming: '_incoming', Optional[Incoming]: '_incoming',
+    Outgoing: '_outgoing', Optional[Outgoing]: '_outgoing',
+}
+_NO_PREDEFINED = {}
 
 
 class Context:
     __slots__ = (
         '_sanic', '_sanic_request', '_direction', '_transport', '_object', '_request', '_response', '_notification',
-        '_incoming', '_outgoing', '_websocket', '_notifier', '_dict',
+        '_incoming', '_outgoing', '_websocket', '_notifier', '_deadline',
+        '_timings',
     )
 
+    @staticmethod
+    def injections(func: Func) -> Injections:
+        return tuple(
+            (arg.annotation, _SLOTS[arg.annotation])
+            for arg in func.parameters.values()
+            if not arg.is_zipped and arg.annotation in _SLOTS
+        )
+
     def __init__(
             self,
             sanic: Sanic,
@@ -47,8 +76,8 @@ class Context:
         self._notification = None
         self._incoming = None
         self._outgoing = None
-
-        self._dict = None
+        self._deadline = None  # type: Optional[float]
+        self._timings = None  # type: Optional[Timings]
 
     def __copy__(self) -> 'Context':
         new = type(self)(self._sanic, self._sanic_request, self._websocket, self._notifier)
@@ -59,6 +88,8 @@ class Context:
         new._notification = self._notification
         new._incoming = self._incoming
         new._outgoing = self._outgoing
+        new._deadline = self._deadline
+        new._timings = self._timings
         return new
 
     def __call__(self, *values: MutableContextValue) -> 'Context':
@@ -89,6 +120,12 @@ class Context:
 
         return new
 
+    def predefined(self, injections: Injections) -> Dict[type, ContextValue]:
+        if not injections:
+            return _NO_PREDEFINED
+
+        return {typ: getattr(self, slot) for typ, slot in injections}
+
     @property
     def direction(self) -> Directions:
         return self._direction
@@ -101,26 +138,6 @@ class Context:
     def object(self) -> Objects:
         return self._object
 
-    @property
-    def dict(self) -> Dict[type, ContextValue]:
-        if self._dict is None:
-            self._dict = {
-                Sanic: self._sanic,
-                SanicRequest: self._sanic_request,
-                Directions: self._direction,
-                Transports: self._transport,
-                Objects: self._object,
-                WebSocket: self._websocket, Optional[WebSocket]: self._websocket,
-                Notifier: self._notifier, Optional[Notifier]: self._notifier,
-                Request: self._request, Optional[Request]: self._request,
-                Response: self._response, Optional[Response]: self._response,
-                Notification: self._notification, Optional[Notification]: self._notification,
-                Incoming: self._incoming, Optional[Incoming]: self._incoming,
-                Outgoing: self._outgoing, Optional[Outgoing]: self._outgoing,
-            }
-
-        return self._dict
-
     @property
     def incoming(self) -> Optional[Incoming]:
         return self._incoming
@@ -136,3 +153,25 @@ class Context:
     @property
     def websocket(self) -> Optional[WebSocket]:
         return self._websocket
+
+    @property
+    def deadline(self) -> Optional[float]:
+        return self._deadline
+
+    @deadline.setter
+    def deadline(self, value: Optional[float]):
+        self._deadline = value
+
+    @property
+    def timings(self) -> Optional[Timings]:
+        return self._timings
+
+    @timings.setter
+    def timings(self, value: Optional[Timings]):
+        self._timings = value
+
+    def mark(self, stage: str):
+        timings = self._timings
+
+        if timings is not None:
+            timings.append((stage, monotonic()))
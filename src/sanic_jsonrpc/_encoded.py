@@ -0,0 +1,15 @@
+from typing import AnyStr
+
+__all__ = [
+    'Encoded',
+]
+
+
+class Encoded:
+    __slots__ = ('data',)
+
+    def __init__(self, data: AnyStr):
+        self.data = data
+
+    def __repr__(self) -> str:
+        return '{}({!r})'.format(type(self).__name__, self.data)
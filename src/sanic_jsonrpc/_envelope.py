@@ -0,0 +1,58 @@
+from typing import Any, Callable, Dict, Optional, Type
+
+from fashionable import Model, UNSET
+
+from .models import Notification, Request
+from .types import Incoming
+
+__all__ = [
+    'parse_envelope',
+]
+
+_Builder = Callable[..., Model]
+
+
+def _compile(model: Type[Model]) -> _Builder:
+    names = tuple(a.private_name for a in getattr(model, '.attributes'))
+    new = model.__new__
+
+    def build(*values: Any) -> Model:
+        obj = new(model)
+
+        for name, value in zip(names, values):
+            setattr(obj, name, value)
+
+        return obj
+
+    return build
+
+
+_build_request = _compile(Request)
+_build_notification = _compile(Notification)
+
+
+def parse_envelope(message: Dict) -> Optional[Incoming]:
+    if not isinstance(message, dict):
+        return None
+
+    jsonrpc = message.get('jsonrpc', '2.0')
+
+    if jsonrpc != '2.0' or not isinstance(jsonrpc, str):
+        return None
+
+    method = message.get('method', UNSET)
+
+    if not isinstance(method, str):
+        return None
+
+    params = message.get('params', UNSET)
+
+    if 'id' not in message:
+        return _build_notification('2.0', method, params)
+
+    id_ = message['id']
+
+    if not isinstance(id_, (str, int)):
+        return None
+
+    return _build_request('2.0', method, params, id_)
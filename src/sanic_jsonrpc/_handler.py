@@ -0,0 +1,60 @@
+from asyncio import Future, iscoroutinefunction
+from typing import Any, Dict, Optional, Tuple
+
+from fashionable import Func
+
+from ._context import Context
+from ._limiter import Limiter
+from ._process import check_cpu_bound
+from .cache import Cache
+from .executors import ThreadExecutor
+
+__all__ = [
+    'Handler',
+    'Route',
+]
+
+
+class Handler:
+    __slots__ = ('func', 'injections', 'executor')
+
+    def __init__(self, func: Func, *, executor: Optional[ThreadExecutor] = None):
+        self.func = func
+        self.injections = Context.injections(func)
+        self.executor = None if iscoroutinefunction(func.func) else executor
+
+    @property
+    def name(self) -> str:
+        return self.func.name
+
+    def call(self, ctx: Context, *args, **kwargs) -> Any:
+        func = self.func[ctx.predefined(self.injections)]
+
+        if self.executor is None:
+            return func(*args, **kwargs)
+
+        return self.executor.run(func, *args, **kwargs)
+
+
+class Route(Handler):
+    __slots__ = ('limiter', 'cache', 'flights', 'process', 'timeout', 'cancellable')
+
+    def __init__(
+            self,
+            func: Func,
+            *,
+            limiter: Optional[Limiter] = None,
+            cache: Optional[Cache] = None,
+            coalesce: bool = False,
+            executor: Optional[ThreadExecutor] = None,
+            cpu_bound: bool = False,
+            timeout: Optional[float] = None,
+            cancellable: bool = False
+    ):
+        super().__init__(func, executor=None if cpu_bound else executor)
+        self.limiter = limiter
+        self.cache = cache
+        self.flights = {} if coalesce else None  # type: Optional[Dict[tuple, Future]]
+        self.process = check_cpu_bound(func, self.injections) if cpu_bound else None  # type: Optional[Tuple[str, str]]
+        self.timeout = timeout
+        self.cancellable = cancellable
@@ -0,0 +1,68 @@
+from asyncio import CancelledError, Future, get_event_loop
+from collections import deque
+from typing import Optional
+
+__all__ = [
+    'Limiter',
+]
+
+
+class Limiter:
+    __slots__ = ('max_concurrency', 'max_queue', 'admitted', 'running', '_waiters')
+
+    def __init__(self, max_concurrency: int, max_queue: Optional[int] = None):
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be >= 1, not {!r}".format(max_concurrency))
+
+        if max_queue is not None and max_queue < 0:
+            raise ValueError("max_queue must be >= 0, not {!r}".format(max_queue))
+
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.admitted = 0
+        self.running = 0
+        self._waiters = deque()
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    def admit(self) -> bool:
+        if self.max_queue is not None and self.admitted >= self.max_concurrency + self.max_queue:
+            return False
+
+        self.admitted += 1
+        return True
+
+    def discharge(self, _fut: Optional[Future] = None):
+        self.admitted -= 1
+
+    async def acquire(self):
+        if self.running < self.max_concurrency and not self._waiters:
+            self.running += 1
+            return
+
+        waiter = get_event_loop().create_future()
+        self._waiters.append(waiter)
+
+        try:
+            await waiter
+        except CancelledError:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+            elif not waiter.cancelled():
+                self.release()
+
+            raise
+
+    def release(self):
+        waiters = self._waiters
+
+        while waiters:
+            waiter = waiters.popleft()
+
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+
+        self.running -= 1
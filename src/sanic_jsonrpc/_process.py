@@ -0,0 +1,38 @@
+from asyncio import iscoroutinefunction
+from importlib import import_module
+from typing import Any, Callable, Dict, Tuple
+
+from fashionable import Func
+
+__all__ = [
+    'call_in_process',
+    'check_cpu_bound',
+]
+
+
+def check_cpu_bound(func: Func, injections: tuple) -> Tuple[str, str]:
+    raw = func.func
+    qualname = getattr(raw, '__qualname__', '')
+
+    if '<locals>' in qualname or not qualname:
+        raise ValueError("cpu_bound route {!r} must be importable by its qualified name".format(func.name))
+
+    if iscoroutinefunction(raw):
+        raise ValueError("cpu_bound route {!r} must be a plain function".format(func.name))
+
+    if injections:
+        raise ValueError("cpu_bound route {!r} cannot receive injected context values".format(func.name))
+
+    return raw.__module__, qualname
+
+
+def call_in_process(module: str, qualname: str, args: tuple, kwargs: Dict[str, Any]) -> Any:
+    obj = import_module(module)  # type: Any
+
+    for name in qualname.split('.'):
+        obj = getattr(obj, name)
+
+    if isinstance(obj, Func):
+        obj = obj.func  # type: Callable
+
+    return obj(*args, **kwargs)
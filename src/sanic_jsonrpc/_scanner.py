@@ -0,0 +1,127 @@
+from re import compile
+from typing import List, Optional
+
+__all__ = [
+    'ArrayScanner',
+]
+
+_STRUCTURE = compile(rb'["\[\]{},]')
+_STRING = compile(rb'["\\]')
+_WHITESPACE = b' \t\n\r'
+_QUOTE, _BACKSLASH, _COMMA = b'"\\,'
+_OPENING = frozenset(b'[{')
+_CLOSING = frozenset(b']}')
+
+
+class ArrayScanner:
+    __slots__ = ('_buffer', '_pos', '_start', '_depth', '_in_string', 'is_array', 'closed', 'invalid', 'count')
+
+    def __init__(self):
+        self._buffer = bytearray()
+        self._pos = 0
+        self._start = 0
+        self._depth = 0
+        self._in_string = False
+        self.is_array = None  # type: Optional[bool]
+        self.closed = False
+        self.invalid = False
+        self.count = 0
+
+    @property
+    def data(self) -> bytes:
+        return bytes(self._buffer)
+
+    def _element(self, end: int, elements: List[bytes]) -> bool:
+        element = bytes(self._buffer[self._start:end]).strip(_WHITESPACE)
+
+        if not element:
+            return False
+
+        elements.append(element)
+        self.count += 1
+        self._start = end + 1
+        return True
+
+    def feed(self, chunk: bytes) -> List[bytes]:
+        buffer = self._buffer
+        buffer += chunk
+        elements = []
+
+        if self.is_array is None:
+            head = buffer.lstrip(_WHITESPACE)
+
+            if not head:
+                return elements
+
+            self.is_array = head[0] == b'['[0]
+
+            if self.is_array:
+                self._depth = 1
+                self._pos = self._start = len(buffer) - len(head) + 1
+
+        if not self.is_array or self.invalid:
+            return elements
+
+        if self.closed:
+            self.invalid = bool(buffer[self._pos:].strip(_WHITESPACE))
+            return elements
+
+        pos = self._pos
+
+        while True:
+            if self._in_string:
+                match = _STRING.search(buffer, pos)
+
+                if not match:
+                    pos = len(buffer)
+                    break
+
+                if buffer[match.start()] == _BACKSLASH:
+                    if match.end() >= len(buffer):
+                        pos = match.start()
+                        break
+
+                    pos = match.end() + 1
+                else:
+                    pos = match.end()
+                    self._in_string = False
+
+                continue
+
+            match = _STRUCTURE.search(buffer, pos)
+
+            if not match:
+                pos = len(buffer)
+                break
+
+            index = match.start()
+            char = buffer[index]
+            pos = index + 1
+
+            if char == _QUOTE:
+                self._in_string = True
+            elif char in _OPENING:
+                self._depth += 1
+            elif char in _CLOSING:
+                self._depth -= 1
+
+                if self._depth:
+                    continue
+
+                self.closed = True
+
+                if char != b']'[0] or not self._element(index, elements) and self.count:
+                    self.invalid = True
+                elif buffer[pos:].strip(_WHITESPACE):
+                    self.invalid = True
+
+                break
+            elif char == _COMMA and self._depth == 1:
+                if not self._element(index, elements):
+                    self.invalid = True
+                    break
+
+        del buffer[:self._start]
+        self._pos = pos - self._start
+        self._start = 0
+        return elements
@@ -0,0 +1,48 @@
+from typing import Dict, Hashable, Optional, Set
+
+__all__ = [
+    'Topics',
+]
+
+
+class Topics:
+    __slots__ = ('_subscribers', '_topics')
+
+    def __init__(self):
+        self._subscribers = {}  # type: Dict[str, Set[Hashable]]
+        self._topics = {}  # type: Dict[Hashable, Set[str]]
+
+    def subscribers(self, topic: str) -> Set[Hashable]:
+        return self._subscribers.get(topic, set())
+
+    def topics(self, subscriber: Hashable) -> Set[str]:
+        return self._topics.get(subscriber, set())
+
+    def subscribe(self, subscriber: Hashable, topic: str) -> bool:
+        topics = self._topics.setdefault(subscriber, set())
+
+        if topic in topics:
+            return False
+
+        topics.add(topic)
+        self._subscribers.setdefault(topic, set()).add(subscriber)
+        return True
+
+    def unsubscribe(self, subscriber: Hashable, topic: Optional[str] = None) -> bool:
+        topics = self._topics.get(subscriber)
+
+        if not topics or topic is not None and topic not in topics:
+            return False
+
+        for name in list(topics) if topic is None else [topic]:
+            topics.discard(name)
+            subscribers = self._subscribers[name]
+            subscribers.discard(subscriber)
+
+            if not subscribers:
+                del self._subscribers[name]
+
+        if not topics:
+            del self._topics[subscriber]
+
+        return True
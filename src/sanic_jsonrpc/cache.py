@@ -0,0 +1,100 @@
+from collections import OrderedDict
+from time import monotonic
+from typing import Any, AnyStr, Hashable, Optional, Tuple
+
+from fashionable import UNSET
+
+from .codecs import RawJson
+
+__all__ = [
+    'Cache',
+]
+
+
+def _freeze(value: Any) -> Hashable:
+    if isinstance(value, dict):
+        return dict, tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+
+    if isinstance(value, list):
+        return list, tuple(_freeze(v) for v in value)
+
+    return type(value), value
+
+
+def _size(data: AnyStr) -> int:
+    return len(data) if isinstance(data, bytes) else len(data.encode())
+
+
+class Cache:
+    __slots__ = ('ttl', 'max_size', 'max_memory', 'hits', 'misses', '_entries', '_memory')
+
+    def __init__(self, ttl: float, *, max_size: Optional[int] = 1024, max_memory: Optional[int] = None):
+        self.ttl = ttl
+        self.max_size = max_size
+        self.max_memory = max_memory
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._memory = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def memory(self) -> int:
+        return self._memory
+
+    @staticmethod
+    def key(method: str, params: Any = UNSET) -> Tuple[str, Hashable]:
+        return method, _freeze(params)
+
+    def _pop(self, key: Hashable):
+        _, _, size = self._entries.pop(key)
+        self._memory -= size
+
+    def get(self, key: Hashable) -> Optional[RawJson]:
+        entry = self._entries.get(key)
+
+        if entry is not None:
+            expires, value, _ = entry
+
+            if expires > monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+
+            self._pop(key)
+
+        self.misses += 1
+        return None
+
+    def set(self, key: Hashable, value: RawJson):
+        size = _size(value.data)
+
+        if self.max_memory is not None and size > self.max_memory:
+            return
+
+        if key in self._entries:
+            self._pop(key)
+
+        self._entries[key] = (monotonic() + self.ttl, value, size)
+        self._memory += size
+
+        while (
+                self.max_size is not None and len(self._entries) > self.max_size
+                or self.max_memory is not None and self._memory > self.max_memory
+        ):
+            self._pop(next(iter(self._entries)))
+
+    def invalidate(self, method: Optional[str] = None, params: Any = UNSET):
+        if method is None:
+            self._entries.clear()
+            self._memory = 0
+        elif params is not UNSET:
+            key = self.key(method, params)
+
+            if key in self._entries:
+                self._pop(key)
+        else:
+            for key in [k for k in self._entries if k[0] == method]:
+                self._pop(key)
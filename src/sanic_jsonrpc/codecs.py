@@ -0,0 +1,70 @@
+from typing import Any, AnyStr, Callable, Tuple, Type
+
+__all__ = [
+    'Codec',
+    'RawJson',
+]
+
+_Dumps = Callable[[Any], AnyStr]
+_Loads = Callable[[AnyStr], Any]
+
+
+def _default(obj: Any) -> Any:
+    if hasattr(obj, 'to_dict'):
+        return obj.to_dict()
+
+    raise TypeError("Object of type {} is not JSON serializable".format(type(obj).__name__))
+
+
+class RawJson:
+    __slots__ = ('data',)
+
+    def __init__(self, data: AnyStr):
+        if not isinstance(data, (str, bytes)):
+            raise TypeError("RawJson data must be str or bytes, not {}".format(type(data).__name__))
+
+        self.data = data
+
+    def __eq__(self, other: 'RawJson') -> bool:
+        if not isinstance(other, RawJson):
+            return NotImplemented
+
+        return self.data == other.data
+
+    def __hash__(self) -> int:
+        return hash(self.data)
+
+    def __repr__(self) -> str:
+        return '{}({!r})'.format(type(self).__name__, self.data)
+
+
+class Codec:
+    __slots__ = ('dumps', 'loads', 'errors')
+
+    def __init__(self, dumps: _Dumps, loads: _Loads, errors: Tuple[Type[Exception], ...] = (TypeError, ValueError)):
+        self.dumps = dumps
+        self.loads = loads
+        self.errors = errors
+
+    @classmethod
+    def ujson(cls) -> 'Codec':
+        from ujson import dumps, loads
+        return cls(dumps, loads)
+
+    @classmethod
+    def json(cls) -> 'Codec':
+        from functools import partial
+        from json import dumps, loads
+        return cls(partial(dumps, default=_default, separators=(',', ':')), loads)
+
+    @classmethod
+    def orjson(cls) -> 'Codec':
+        from functools import partial
+        from orjson import dumps, loads
+        return cls(partial(dumps, default=_default), loads)
+
+    @classmethod
+    def msgspec(cls) -> 'Codec':
+        from msgspec import DecodeError
+        from msgspec.json import Decoder, Encoder
+        return cls(Encoder(enc_hook=_default).encode, Decoder().decode, (TypeError, ValueError, DecodeError))
@@ -6,6 +6,9 @@ __all__ = [
     'INVALID_REQUEST',
     'METHOD_NOT_FOUND',
     'PARSE_ERROR',
+    'REQUEST_CANCELLED',
+    'REQUEST_TIMEOUT',
+    'SERVER_BUSY',
 ]
 
 PARSE_ERROR = Error(-32700, "Parse error")
@@ -13,3 +16,6 @@ INVALID_REQUEST = Error(-32600, "Invalid Request")
 METHOD_NOT_FOUND = Error(-32601, "Method not found")
 INVALID_PARAMS = Error(-32602, "Invalid params")
 INTERNAL_ERROR = Error(-32603, "Internal error")
+SERVER_BUSY = Error(-32000, "Server busy")
+REQUEST_TIMEOUT = Error(-32001, "Request timeout")
+REQUEST_CANCELLED = Error(-32800, "Request cancelled")
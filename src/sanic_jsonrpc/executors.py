@@ -0,0 +1,101 @@
+from asyncio import AbstractEventLoop, CancelledError, get_event_loop, wrap_future
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
+from os import cpu_count
+from typing import Any, Callable, Optional
+
+from ._limiter import Limiter
+from .errors import SERVER_BUSY
+from .models import Error
+
+__all__ = [
+    'ThreadExecutor',
+]
+
+_THREAD_NAME_PREFIX = 'sanic-jsonrpc'
+
+
+def _thread_pool(max_workers: int) -> ThreadPoolExecutor:
+    try:
+        return ThreadPoolExecutor(max_workers, thread_name_prefix=_THREAD_NAME_PREFIX)
+    except TypeError:
+        # Python 3.5 does not name pool threads
+        return ThreadPoolExecutor(max_workers)
+
+
+class ThreadExecutor:
+    __slots__ = ('busy_error', 'rejected', '_limiter', '_pool')
+
+    def __init__(
+            self,
+            max_workers: Optional[int] = None,
+            max_queue: Optional[int] = None,
+            *,
+            busy_error: Error = SERVER_BUSY
+    ):
+        if max_workers is None:
+            max_workers = min(32, (cpu_count() or 1) + 4)
+
+        self.busy_error = busy_error
+        self.rejected = 0
+        self._limiter = Limiter(max_workers, max_queue)
+        self._pool = None  # type: Optional[ThreadPoolExecutor]
+
+    @property
+    def max_workers(self) -> int:
+        return self._limiter.max_concurrency
+
+    @property
+    def max_queue(self) -> Optional[int]:
+        return self._limiter.max_queue
+
+    @property
+    def running(self) -> int:
+        return self._limiter.running
+
+    @property
+    def queued(self) -> int:
+        return self._limiter.queued
+
+    async def run(self, func: Callable, *args, **kwargs) -> Any:
+        limiter = self._limiter
+
+        if not limiter.admit():
+            self.rejected += 1
+            busy_error = self.busy_error
+            # A fresh copy, so tracebacks do not pile up on the shared error
+            raise Error(busy_error.code, busy_error.message, busy_error.data)
+
+        try:
+            await limiter.acquire()
+        except CancelledError:
+            limiter.discharge()
+            raise
+
+        try:
+            if self._pool is None:
+                self._pool = _thread_pool(self.max_workers)
+
+            future = self._pool.submit(partial(func, *args, **kwargs))
+        except Exception:
+            self._finished()
+            raise
+
+        # The slot is held until the thread is done, even if the awaiting call is cancelled first
+        future.add_done_callback(partial(self._schedule_finished, get_event_loop()))
+        return await wrap_future(future)
+
+    def _finished(self, _future: Optional[Future] = None):
+        self._limiter.release()
+        self._limiter.discharge()
+
+    def _schedule_finished(self, loop: AbstractEventLoop, future: Future):
+        try:
+            loop.call_soon_threadsafe(self._finished, future)
+        except RuntimeError:
+            pass
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False)
+            self._pool = None
@@ -1,51 +1,108 @@
-from asyncio import Future, Queue, ensure_future, iscoroutine, shield
-from collections import defaultdict
-from typing import Any, AnyStr, Callable, Dict, List, Optional, Type, Union
+from asyncio import CancelledError, Future, ensure_future, get_event_loop, iscoroutine, shield, wait
+from concurrent.futures import ProcessPoolExecutor
+from copy import deepcopy
+from functools import partial
+from time import monotonic
+from typing import Any, AnyStr, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple, Type, Union
 
-from fashionable import ArgError, CIStr, Func, ModelAttributeError, ModelError, RetError, UNSET
-from ujson import dumps, loads
+from fashionable import ArgError, CIStr, Func, RetError, UNSET
 
 from .._context import Context
-from .._middleware import Objects, Predicates
-from ..errors import INTERNAL_ERROR, INVALID_PARAMS, INVALID_REQUEST, METHOD_NOT_FOUND, PARSE_ERROR
+from .._encoded import Encoded
+from .._envelope import parse_envelope
+from .._handler import Handler, Route
+from .._limiter import Limiter
+from .._middleware import Directions, Objects, Predicates
+from .._process import call_in_process
+from ..cache import Cache
+from ..codecs import Codec, RawJson
+from ..errors import (
+    INTERNAL_ERROR, INVALID_PARAMS, INVALID_REQUEST, METHOD_NOT_FOUND, PARSE_ERROR, REQUEST_CANCELLED, REQUEST_TIMEOUT,
+    SERVER_BUSY,
+)
+from ..executors import ThreadExecutor
 from ..loggers import error_logger, logger, traffic_logger
-from ..models import Error, Notification, Request, Response
-from ..types import AnyJsonrpc
+from ..metrics import Metrics
+from ..models import Error, Response
+from ..types import AnyJsonrpc, Outgoing, TimingsSink
 
 __all__ = [
     'BaseJsonrpc',
 ]
 
+_Chain = Callable[[Context], Optional[Awaitable]]
+_CONSTANT_ERRORS = (PARSE_ERROR, INVALID_REQUEST, METHOD_NOT_FOUND, INVALID_PARAMS, INTERNAL_ERROR)
+_RAW_MARKER = 'sanic_jsonrpc.RawJson'
+
+
+class _TimedOut(Exception):
+    pass
+
+
+class _Shared:
+    __slots__ = ('value', 'raw')
+
+    def __init__(self, value: Any, raw: Optional[RawJson] = None):
+        self.value = value
+        self.raw = raw
+
 
 class BaseJsonrpc:
     @staticmethod
-    def _parse_json(json: AnyStr) -> Union[Dict, List[Dict], Response]:
-        try:
-            return loads(json)
-        except (TypeError, ValueError):
-            return Response(error=PARSE_ERROR)
+    async def _func(handler: Handler, ctx: Context, *args, **kwargs) -> Any:
+        ret = handler.call(ctx, *args, **kwargs)
+
+        if iscoroutine(ret):
+            ret = await ret
+
+        return ret
 
     @staticmethod
-    def _parse_message(message: Dict) -> AnyJsonrpc:
-        try:
-            return Request(**message)
-        except (TypeError, ModelError) as err:
-            if isinstance(err, ModelAttributeError) and err.kwargs['attr'] == 'id':
-                return Notification(**message)
+    def _chain(handlers: Sequence[Handler]) -> _Chain:
+        count = len(handlers)
+
+        def run(ctx: Context, start: int = 0) -> Optional[Awaitable]:
+            for i in range(start, count):
+                handler = handlers[i]
+                logger.debug("Calling middleware %r", handler.name)
+                ret = handler.call(ctx)
 
-            return Response(error=INVALID_REQUEST)
+                if iscoroutine(ret):
+                    return resume(ret, ctx, i + 1)
+
+        async def resume(ret: Awaitable, ctx: Context, start: int):
+            await ret
+            ret = run(ctx, start)
+
+            if ret is not None:
+                await ret
+
+        return run
 
     @staticmethod
-    async def _func(func: Func, ctx: Context, *args, **kwargs) -> Any:
-        ret = func[ctx.dict](*args, **kwargs)
+    async def _staged(route: Route, ctx: Context, *args, **kwargs) -> Any:
+        func = route.func
+        args, kwargs = func._validate(args, kwargs, ctx.predefined(route.injections))
+        ctx.mark('validated')
 
-        if iscoroutine(ret):
-            ret = await ret
+        if route.executor is None:
+            ret = func.func(*args, **kwargs)
+
+            if iscoroutine(ret):
+                ret = await ret
+        else:
+            ret = await route.executor.run(func.func, *args, **kwargs)
 
+        ctx.mark('handled')
+        ret = func._out(ret)
+        ctx.mark('returned')
         return ret
 
     @staticmethod
-    def _finalise_future(fut: Future) -> Optional[Union[Response, str]]:
+    def _finalise_future(fut: Future) -> Optional[Union[Response, Encoded, str]]:
+        if fut.cancelled():
+            return None
+
         if fut.done():
             err = fut.exception()
 
@@ -56,69 +113,360 @@ class BaseJsonrpc:
         else:
             fut.cancel()
 
-    @classmethod
-    def _parse_messages(cls, json: AnyStr) -> Union[AnyJsonrpc, List[AnyJsonrpc]]:
-        messages = cls._parse_json(json)
+    def _parse_json(self, json: AnyStr) -> Union[Dict, List[Dict], Encoded]:
+        try:
+            return self._codec.loads(json)
+        except self._codec.errors:
+            return self._encoded_error(PARSE_ERROR)
+
+    def _parse_message(self, message: Dict) -> Union[AnyJsonrpc, Encoded]:
+        incoming = parse_envelope(message)
+
+        if incoming is None:
+            return self._encoded_error(INVALID_REQUEST)
+
+        return incoming
+
+    def _parse_messages(
+            self,
+            json: AnyStr,
+            ctx: Context
+    ) -> Union[AnyJsonrpc, Encoded, List[Union[AnyJsonrpc, Encoded]]]:
+        messages = self._parse_json(json)
+        ctx.mark('decoded')
 
-        if isinstance(messages, Response):
+        if isinstance(messages, Encoded):
             return messages
 
         if isinstance(messages, list):
             if not messages:
-                return Response(error=INVALID_REQUEST)
+                return self._encoded_error(INVALID_REQUEST)
+
+            incomings = [self._parse_message(m) for m in messages]
+        else:
+            incomings = self._parse_message(messages)
+
+        ctx.mark('parsed')
+        return incomings
+
+    def _compile_error(self, error: Error) -> Optional[Tuple[AnyStr, AnyStr, Encoded]]:
+        data = self._codec.dumps(Response(error=error))
+        tail = data[-1:]
+        suffix = self._codec.dumps(None) + tail
+
+        if not data.endswith(suffix):
+            return None
+
+        return data[:-len(suffix)], tail, Encoded(data)
+
+    def _compile_raw(self) -> Optional[Tuple[AnyStr, AnyStr, AnyStr]]:
+        parts = self._codec.dumps(Response(result=_RAW_MARKER)).split(self._codec.dumps(_RAW_MARKER))
+
+        if len(parts) != 2:
+            return None
 
-            return [cls._parse_message(m) for m in messages]
+        head, rest = parts
+        tail = rest[-1:]
+        suffix = self._codec.dumps(None) + tail
 
-        return cls._parse_message(messages)
+        if not rest.endswith(suffix):
+            return None
 
-    @classmethod
-    def _serialize(cls, obj: Any) -> str:
+        return head, rest[:-len(suffix)], tail
+
+    def _encode_raw(self, raw: RawJson, id_: Optional[Union[str, int]]) -> AnyStr:
+        data = raw.data
+
+        if isinstance(data, bytes) is not self._binary:
+            data = data.encode() if self._binary else data.decode()
+
+        if self._raw_template is None:
+            return self._serialize(Response(result=self._codec.loads(data), id=id_))
+
+        head, middle, tail = self._raw_template
+        return head + data + middle + self._codec.dumps(id_) + tail
+
+    def _encoded_error(self, error: Error, id_: Optional[Union[str, int]] = None) -> Encoded:
+        template = self._error_templates.get(id(error))
+
+        if template is None:
+            return Encoded(self._serialize(Response(error=error, id=id_)))
+
+        head, tail, null = template
+
+        if id_ is None:
+            return null
+
+        return Encoded(head + self._codec.dumps(id_) + tail)
+
+    def _serialize(self, obj: Any) -> AnyStr:
         try:
-            return dumps(obj)
+            return self._codec.dumps(obj)
         except Exception as err:
             error_logger.error("Failed to serialize object %r: %s", obj, err, exc_info=err)
-            return cls._serialize(Response(error=INTERNAL_ERROR))
+            return self._encoded_error(INTERNAL_ERROR).data
+
+    def _encode(self, obj: Union[Outgoing, Encoded]) -> AnyStr:
+        if isinstance(obj, Encoded):
+            return obj.data
+
+        if isinstance(obj, Response):
+            result = obj.result
+
+            if result is UNSET:
+                error = obj.error
+
+                for constant in self._constant_errors:
+                    if error is constant:
+                        return self._encoded_error(error, obj.id).data
+            elif isinstance(result, RawJson):
+                try:
+                    return self._encode_raw(result, obj.id)
+                except Exception as err:
+                    error_logger.error("Failed to encode raw result %r: %s", result, err, exc_info=err)
+                    return self._encoded_error(INTERNAL_ERROR, obj.id).data
+
+        return self._serialize(obj)
+
+    def _encode_batch(self, objs: List[Union[Outgoing, Encoded]]) -> AnyStr:
+        opening, separator, closing = self._brackets
+        return opening + separator.join([self._encode(o) for o in objs]) + closing
 
     def _handle_incoming(
-            self, ctx: Context, failure_cb: Callable[[Response], None], success_cb: Callable[[Future], None]
-    ) -> bool:
-        func = self._routes.get((
+            self, ctx: Context, failure_cb: Callable[[Encoded], None], success_cb: Callable[[Future], None]
+    ) -> Optional[Future]:
+        if ctx.timings is not None:
+            ctx.timings = list(ctx.timings)
+
+        route = self._routes.get((
             ctx.transport,
             ctx.object,
             CIStr(ctx.incoming.method) if self._case_insensitive else ctx.incoming.method,
         ))
 
-        if not func:
+        if not route:
             if ctx.object is Objects.request:
-                failure_cb(Response(error=METHOD_NOT_FOUND, id=ctx.incoming.id))
+                failure_cb(self._encoded_error(METHOD_NOT_FOUND, ctx.incoming.id))
             else:
                 logger.info("Unhandled %r", ctx.incoming)
 
-            return False
+            return None
+
+        deadline = ctx.deadline
 
-        fut = self._register_call(func, ctx)
+        if deadline is not None and deadline <= monotonic():
+            if self._metrics is not None:
+                self._metrics.series(ctx.transport, route.name).reject(self._timeout_error.code)
+
+            if ctx.object is Objects.request:
+                failure_cb(self._encoded_error(self._timeout_error, ctx.incoming.id))
+            else:
+                logger.info("Dropped %r: deadline passed", ctx.incoming)
+
+            return None
+
+        limiter = route.limiter
+
+        if limiter is not None and not limiter.admit():
+            if self._metrics is not None:
+                self._metrics.series(ctx.transport, route.name).reject(self._busy_error.code)
+
+            if ctx.object is Objects.request:
+                failure_cb(self._encoded_error(self._busy_error, ctx.incoming.id))
+            else:
+                logger.info("Dropped %r: %r is busy", ctx.incoming, route.name)
+
+            return None
+
+        task = self._register_call(route, ctx)
 
         if ctx.object is Objects.request:
-            success_cb(fut)
+            success_cb(task if route.cancellable else shield(task))
+
+        return task
+
+    def _register_call(self, route: Route, ctx: Context) -> Future:
+        coro = self._call(route, ctx) if self._metrics is None else self._measure(route, ctx)
+        task = ensure_future(coro if ctx.timings is None else self._report(ctx, coro))
+        self._calls.add(task)
+        task.add_done_callback(self._calls.discard)
+
+        if route.limiter is not None:
+            task.add_done_callback(route.limiter.discharge)
+
+        return task
+
+    def _freeze_middlewares(self) -> Dict[tuple, _Chain]:
+        self._chains = {key: self._chain(tuple(handlers)) for key, handlers in self._middlewares.items() if handlers}
+        return self._chains
+
+    def _run_middlewares(self, ctx: Context) -> Optional[Awaitable]:
+        chains = self._chains
 
-        return True
+        if chains is None:
+            chains = self._freeze_middlewares()
 
-    def _register_call(self, func: Func, ctx: Context) -> Future:
-        fut = shield(self._call(func, ctx))
-        self._calls.put_nowait(fut)
-        return fut
+        chain = chains.get((ctx.direction, ctx.transport, ctx.object))
+        return chain(ctx) if chain else None
 
-    async def _run_middlewares(self, ctx: Context):
-        for func in self._middlewares[(ctx.direction, ctx.transport, ctx.object)]:
-            logger.debug("Calling middleware %r", func.name)
-            await self._func(func, ctx)
+    def _intercepted(self, ctx: Context) -> bool:
+        chains = self._chains
 
-    async def _call(self, func: Func, ctx: Context) -> Optional[Response]:
+        if chains is None:
+            chains = self._freeze_middlewares()
+
+        return (Directions.outgoing, ctx.transport, Objects.response) in chains
+
+    def _share(self, route: Route, key: tuple, ret: Any) -> Any:
+        if isinstance(ret, Error) or route.cache is None:
+            return _Shared(ret)
+
+        raw = ret if isinstance(ret, RawJson) else RawJson(self._codec.dumps(ret))
+        route.cache.set(key, raw)
+        return _Shared(ret, raw)
+
+    def _unshare(self, shared: _Shared, intercepted: bool, copy: bool) -> Any:
+        value = shared.value
+
+        if isinstance(value, Error):
+            return value
+
+        if not intercepted:
+            return value if shared.raw is None else shared
+
+        if not copy or isinstance(value, RawJson):
+            return value
+
+        return deepcopy(value) if shared.raw is None else self._codec.loads(shared.raw.data)
+
+    async def _process(self, route: Route, ctx: Context, *args, **kwargs) -> Any:
+        if self._process_pool is None:
+            self._process_pool = ProcessPoolExecutor(self._process_workers)
+
+        func = route.func
+        args, kwargs = func._validate(args, kwargs, {})
+        ctx.mark('validated')
+        call = partial(call_in_process, *route.process, args, kwargs)
+        ret = await get_event_loop().run_in_executor(self._process_pool, call)
+        ctx.mark('handled')
+        ret = func._out(ret)
+        ctx.mark('returned')
+        return ret
+
+    async def _execute(self, route: Route, ctx: Context) -> Any:
+        params = ctx.incoming.params
+        if route.process is not None:
+            call = self._process
+        elif ctx.timings is not None:
+            call = self._staged
+        else:
+            call = self._func
+
+        limiter = route.limiter
+
+        if limiter is not None:
+            await limiter.acquire()
+
+        try:
+            if params is UNSET:
+                return await call(route, ctx)
+            elif isinstance(params, list):
+                return await call(route, ctx, *params)
+            elif isinstance(params, dict):
+                return await call(route, ctx, **params)
+            else:
+                return await call(route, ctx, params)
+        finally:
+            if limiter is not None:
+                limiter.release()
+
+    async def _invoke(self, route: Route, ctx: Context) -> Any:
+        cache = route.cache
+        flights = route.flights
+
+        if cache is None and flights is None or ctx.object is not Objects.request:
+            return await self._execute(route, ctx)
+
+        key = Cache.key(route.name, ctx.incoming.params)
+        intercepted = self._intercepted(ctx)
+
+        if cache is not None:
+            hit = cache.get(key)
+
+            if hit is not None:
+                return self._codec.loads(hit.data) if intercepted else hit
+
+        if flights is None:
+            return self._unshare(self._share(route, key, await self._execute(route, ctx)), intercepted, False)
+
+        while key in flights:
+            flight = flights[key]
+
+            try:
+                return self._unshare(await shield(flight), intercepted, True)
+            except CancelledError:
+                if not flight.cancelled():
+                    raise
+
+        flight = flights[key] = Future()
+
+        try:
+            shared = self._share(route, key, await self._execute(route, ctx))
+        except CancelledError:
+            flight.cancel()
+            raise
+        except Exception as err:
+            flight.set_exception(err)
+            flight.exception()
+            raise
+        else:
+            flight.set_result(shared)
+            return self._unshare(shared, intercepted, False)
+        finally:
+            del flights[key]
+
+    async def _bounded(self, route: Route, ctx: Context) -> Any:
+        timeout = route.timeout
+        deadline = ctx.deadline
+
+        if deadline is not None:
+            remaining = deadline - monotonic()
+            timeout = remaining if timeout is None else min(timeout, remaining)
+
+        if timeout is None:
+            return await self._invoke(route, ctx)
+
+        if timeout > 0:
+            task = ensure_future(self._invoke(route, ctx))
+
+            try:
+                done, _ = await wait((task,), timeout=timeout)
+            except CancelledError:
+                task.cancel()
+                raise
+
+            if done:
+                return task.result()
+
+            task.cancel()
+
+        logger.info("%r timed out", ctx.incoming)
+        raise _TimedOut()
+
+    async def _call(self, route: Route, ctx: Context) -> Optional[Response]:
         error = UNSET
         result = UNSET
+        shared = None  # type: Optional[_Shared]
 
         try:
-            await self._run_middlewares(ctx)
+            pending = self._run_middlewares(ctx)
+
+            if pending is not None:
+                await pending
+
+            ctx.mark('middlewares_in')
+        except CancelledError:
+            raise
         except Error as err:
             error = err
         except Exception as err:
@@ -126,17 +474,11 @@ class BaseJsonrpc:
             error = INTERNAL_ERROR
         else:
             traffic_logger.debug("--> %r", ctx.incoming)
-            params = ctx.incoming.params
 
             try:
-                if params is UNSET:
-                    ret = await self._func(func, ctx)
-                elif isinstance(params, list):
-                    ret = await self._func(func, ctx, *params)
-                elif isinstance(params, dict):
-                    ret = await self._func(func, ctx, **params)
-                else:
-                    ret = await self._func(func, ctx, params)
+                ret = await self._bounded(route, ctx)
+            except _TimedOut:
+                error = self._timeout_error
             except RetError as err:
                 error_logger.error(err, exc_info=err)
                 error = INTERNAL_ERROR
@@ -145,6 +487,8 @@ class BaseJsonrpc:
                 error = INVALID_PARAMS
             except Error as err:
                 error = err
+            except CancelledError:
+                raise
             except Exception as exc:
                 exc_type = type(exc)
                 handler = self._exceptions.get(exc_type)
@@ -154,6 +498,8 @@ class BaseJsonrpc:
 
                     try:
                         ret = await self._func(handler, ctx, exc)
+                    except CancelledError:
+                        raise
                     except Exception as err:
                         error_logger.error(
                             "Recovery from %s while handling %r failed: %s", exc, ctx.incoming, err, exc_info=err
@@ -168,6 +514,10 @@ class BaseJsonrpc:
                     error_logger.error("%r failed: %s", ctx.incoming, exc, exc_info=exc)
                     error = INTERNAL_ERROR
             else:
+                if isinstance(ret, _Shared):
+                    shared = ret
+                    ret = shared.value
+
                 if isinstance(ret, Error):
                     error = ret
                 else:
@@ -178,7 +528,12 @@ class BaseJsonrpc:
             ctx = ctx(response)
 
             try:
-                await self._run_middlewares(ctx)
+                pending = self._run_middlewares(ctx)
+
+                if pending is not None:
+                    await pending
+            except CancelledError:
+                raise
             except Error as err:
                 response.result = UNSET
                 response.error = err
@@ -187,46 +542,151 @@ class BaseJsonrpc:
                 response.result = UNSET
                 response.error = INTERNAL_ERROR
 
+            ctx.mark('middlewares_out')
             traffic_logger.debug("<-- %r", response)
+
+            if shared is not None:
+                response.result = shared.raw
             return response
 
-    async def _processing(self):
-        calls = self._calls
+    async def _measure(self, route: Route, ctx: Context) -> Optional[Response]:
+        series = self._metrics.series(ctx.transport, route.name)
+        series.enter()
+        start = monotonic()
+        code = None
 
-        while True:
-            call = await calls.get()
-            await call
+        try:
+            response = await self._call(route, ctx)
+        except CancelledError:
+            code = self._cancelled_error.code
+            raise
+        else:
+            if response is not None and response.error is not UNSET:
+                code = response.error.code
+
+            return response
+        finally:
+            series.exit(monotonic() - start, code)
+
+    async def _report(self, ctx: Context, coro: Awaitable) -> Optional[Union[Response, Encoded]]:
+        try:
+            response = await coro
+
+            if response is not None:
+                response = Encoded(self._encode(response))
+                ctx.mark('serialized')
+
+            return response
+        finally:
+            try:
+                self._timings_sink(ctx.transport, ctx.incoming, ctx.timings)
+            except Exception as err:
+                error_logger.error("Timings sink failed for %r: %s", ctx.incoming, err, exc_info=err)
+
+    def _start_timings(self, ctx: Context):
+        if self._timings_sink is not None:
+            ctx.timings = [('received', monotonic())]
 
     async def _start_processing(self, _app, _loop):
-        self._calls = Queue()
-        self._processing_task = ensure_future(self._processing())
+        self._freeze_middlewares()
+
+        if self._process_pool is None and any(r.process is not None for r in self._routes.values()):
+            self._process_pool = ProcessPoolExecutor(self._process_workers)
 
     async def _stop_processing(self, _app, _loop):
-        self._processing_task.cancel()
+        if self._calls:
+            _, pending = await wait(set(self._calls), timeout=self._shutdown_timeout)
+
+            if pending:
+                logger.warning("Cancelling %d calls still running after shutdown timeout", len(pending))
+
+                for task in pending:
+                    task.cancel()
 
-        calls = self._calls
+                await wait(pending)
 
-        while not calls.empty():
-            await calls.get_nowait()
+        for executor in self._executors:
+            executor.shutdown()
 
-    def __init__(self, *, case_insensitive: bool):
-        self._middlewares = defaultdict(list)
+        if self._process_pool is not None:
+            self._process_pool.shutdown(wait=False)
+            self._process_pool = None
+
+    def __init__(
+            self,
+            *,
+            case_insensitive: bool,
+            codec: Optional[Codec] = None,
+            shutdown_timeout: Optional[float] = None,
+            busy_error: Error = SERVER_BUSY,
+            timeout: Optional[float] = None,
+            timeout_error: Error = REQUEST_TIMEOUT,
+            cancelled_error: Error = REQUEST_CANCELLED,
+            executor: Optional[ThreadExecutor] = None,
+            process_workers: Optional[int] = None,
+            cancel_on_disconnect: bool = False,
+            metrics: Optional[Metrics] = None,
+            timings_sink: Optional[TimingsSink] = None
+    ):
+        self._middlewares = {}
+        self._chains = None
         self._exceptions = {}
         self._routes = {}
-        self._calls = None
+        self._calls = set()
+        self._executor = executor
+        self._executors = set() if executor is None else {executor}
+        self._process_workers = process_workers
+        self._process_pool = None  # type: Optional[ProcessPoolExecutor]
+        self._cancel_on_disconnect = cancel_on_disconnect
+        self._metrics = metrics
+        self._timings_sink = timings_sink
+        self._shutdown_timeout = shutdown_timeout
         self._case_insensitive = case_insensitive
-
-    def middleware(self, predicate: Union[Predicates, str], name: Optional[str] = None) -> Callable:
+        self._codec = codec or Codec.ujson()
+        self._binary = isinstance(self._codec.dumps(None), bytes)
+        self._brackets = (b'[', b',', b']') if self._binary else ('[', ',', ']')
+        self._busy_error = busy_error
+        self._timeout = timeout
+        self._timeout_error = timeout_error
+        self._cancelled_error = cancelled_error
+        self._constant_errors = _CONSTANT_ERRORS + (busy_error, timeout_error, cancelled_error)
+        self._error_templates = {}
+
+        for error in self._constant_errors:
+            self._error_templates[id(error)] = self._compile_error(error)
+
+        self._raw_template = self._compile_raw()
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._calls)
+
+    @property
+    def metrics(self) -> Optional[Metrics]:
+        return self._metrics
+
+    def middleware(
+            self,
+            predicate: Union[Predicates, str],
+            name: Optional[str] = None,
+            executor: Optional[ThreadExecutor] = UNSET
+    ) -> Callable:
         if isinstance(predicate, Callable):
             return self.middleware(Predicates.any)(predicate)
 
         if isinstance(predicate, str):
             predicate = Predicates[predicate]
 
+        if executor is UNSET:
+            executor = self._executor
+        elif executor is not None:
+            self._executors.add(executor)
+
         predicate = predicate.value
 
         def deco(func: Callable) -> Callable:
             func = Func.fashionable(func, name, False, {'return_': Func.empty})
+            handler = Handler(func, executor=executor)
             keys = {
                 (d, t, o)
                 for d in predicate.directions
@@ -235,7 +695,9 @@ class BaseJsonrpc:
             }
 
             for key in keys:
-                self._middlewares[key].append(func)
+                self._middlewares.setdefault(key, []).append(handler)
+
+            self._chains = None
 
             return func
         return deco
@@ -243,9 +705,10 @@ class BaseJsonrpc:
     def exception(self, *exceptions: Type[Exception]):
         def deco(func: Callable) -> Callable:
             func = Func.fashionable(func, None, False, {'return_': Func.empty})
+            handler = Handler(func)
 
             for exception in exceptions:
-                self._exceptions[exception] = func
+                self._exceptions[exception] = handler
 
             return func
         return deco
@@ -255,10 +718,43 @@ class BaseJsonrpc:
             method_: Optional[str] = None,
             *,
             predicate_: Predicates = Predicates.incoming,
+            max_concurrency_: Optional[int] = None,
+            max_queue_: Optional[int] = None,
+            cache_: Optional[Union[Cache, float]] = None,
+            coalesce_: bool = False,
+            executor_: Optional[ThreadExecutor] = UNSET,
+            cpu_bound_: bool = False,
+            timeout_: Optional[float] = UNSET,
+            cancel_on_disconnect_: bool = UNSET,
             **annotations: type
     ) -> Callable:
         if isinstance(method_, Callable):
-            return self.__call__(predicate_=predicate_)(method_)
+            deco = self.__call__(
+                predicate_=predicate_,
+                max_concurrency_=max_concurrency_,
+                max_queue_=max_queue_,
+                cache_=cache_,
+                coalesce_=coalesce_,
+                executor_=executor_,
+                cpu_bound_=cpu_bound_,
+                timeout_=timeout_,
+                cancel_on_disconnect_=cancel_on_disconnect_,
+            )
+            return deco(method_)
+
+        if timeout_ is UNSET:
+            timeout_ = self._timeout
+
+        if cancel_on_disconnect_ is UNSET:
+            cancel_on_disconnect_ = self._cancel_on_disconnect
+
+        if executor_ is UNSET:
+            executor_ = self._executor
+        elif executor_ is not None:
+            self._executors.add(executor_)
+
+        if cache_ is not None and not isinstance(cache_, Cache):
+            cache_ = Cache(cache_)
 
         predicate = predicate_.value
 
@@ -267,8 +763,19 @@ class BaseJsonrpc:
                 annotations['return_'] = annotations.pop('result')
 
             func = Func.fashionable(func, method_, self._case_insensitive, annotations)
+            limiter = None if max_concurrency_ is None else Limiter(max_concurrency_, max_queue_)
+            route = Route(
+                func,
+                limiter=limiter,
+                cache=cache_,
+                coalesce=coalesce_,
+                executor=executor_,
+                cpu_bound=cpu_bound_,
+                timeout=timeout_,
+                cancellable=cancel_on_disconnect_,
+            )
             self._routes.update({
-                (t, o, CIStr(func.name) if self._case_insensitive else func.name): func
+                (t, o, CIStr(func.name) if self._case_insensitive else func.name): route
                 for t in predicate.transports
                 for o in predicate.objects
             })
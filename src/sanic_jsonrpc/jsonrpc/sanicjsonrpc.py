@@ -1,20 +1,37 @@
-from asyncio import CancelledError, FIRST_COMPLETED, Future, ensure_future, gather, wait
+from asyncio import CancelledError, FIRST_COMPLETED, Future, as_completed, ensure_future, gather, shield, wait
+from functools import partial
 from http import HTTPStatus
-from time import monotonic
-from typing import Any, Optional
+from math import isfinite
+from time import monotonic, time
+from typing import Any, AnyStr, Callable, Dict, List, Optional, Set, Union
 
 from fashionable import UNSET
 from sanic import Sanic
 from sanic.request import Request as SanicRequest
-from sanic.response import HTTPResponse, json
+from sanic.response import HTTPResponse, StreamingHTTPResponse, stream
 from websockets import WebSocketCommonProtocol as WebSocket
 
+try:
+    from websockets.frames import OP_TEXT
+except ImportError:
+    from websockets.framing import OP_TEXT
+
 from ._basejsonrpc import BaseJsonrpc
+from .._batcher import FrameBatcher
+from .._bus import Bus
+from .._topics import Topics
 from .._context import Context
-from .._middleware import Directions, Predicates
-from ..loggers import access_logger, error_logger, traffic_logger
-from ..models import Notification, Request, Response
-from ..notifier import Notifier
+from .._encoded import Encoded
+from .._scanner import ArrayScanner
+from .._middleware import Directions, Objects, Predicates
+from ..codecs import Codec
+from ..errors import INVALID_REQUEST, PARSE_ERROR, REQUEST_CANCELLED, REQUEST_TIMEOUT, SERVER_BUSY
+from ..executors import ThreadExecutor
+from ..loggers import access_logger, error_logger, logger, traffic_logger
+from ..metrics import Metrics
+from ..models import Error, Notification, Request, Response
+from ..notifier import Notifier, Overflow
+from ..types import AnyJsonrpc, Outgoing, TimingsSink
 
 __all__ = [
     'Jsonrpc',
@@ -22,6 +39,12 @@ __all__ = [
     'SanicJsonrpc',
 ]
 
+_DEADLINE_HEADER = 'X-Jsonrpc-Deadline'
+_DEADLINE_FIELD = 'deadline'
+_CANCEL_METHOD = '$/cancelRequest'
+_BATCH_ARG = 'batch'
+_BATCH_ON = ('1', 'true')
+
 
 class SanicJsonrpc(BaseJsonrpc):
     @staticmethod
@@ -44,105 +67,303 @@ class SanicJsonrpc(BaseJsonrpc):
 
         return value
 
-    @classmethod
-    def _ws_outgoing(cls, ctx: Context) -> Future:
-        return ensure_future(ctx.websocket.send(cls._serialize(ctx.outgoing)))
+    @staticmethod
+    def _parse_deadline(value: Any) -> Optional[float]:
+        if isinstance(value, bool):
+            return None
+
+        try:
+            value = float(value)
+        except (TypeError, ValueError):
+            return None
 
-    async def _post(self, sanic_request: SanicRequest) -> HTTPResponse:
-        ctx = Context(self.app, sanic_request)
+        if not isfinite(value):
+            return None
+
+        return monotonic() + value - time()
+
+    @staticmethod
+    async def _ws_send(ws: WebSocket, data: AnyStr):
+        if isinstance(data, bytes):
+            if hasattr(ws, 'write_frame'):
+                await ws.ensure_open()
+                await ws.write_frame(True, OP_TEXT, data)
+                return
+
+            data = data.decode()
+
+        await ws.send(data)
+
+    def _ws_outgoing(self, ws: WebSocket, obj: Union[Outgoing, Encoded]) -> Future:
+        batcher = self._batchers.get(ws)
+
+        if batcher is None:
+            return ensure_future(self._ws_send(ws, self._encode(obj)))
+
+        return batcher.add(self._encode(obj))
+
+    async def _post_stream(
+            self,
+            responses: List[Union[Response, Encoded]],
+            futures: List[Future],
+            sanic_response: StreamingHTTPResponse,
+    ):
+        opening, separator, closing = self._brackets
+        prefix = opening
+
+        try:
+            for response in responses:
+                await sanic_response.write(prefix + self._encode(response))
+                prefix = separator
+
+            for fut in as_completed(futures):
+                await sanic_response.write(prefix + self._encode(await fut))
+                prefix = separator
+
+            await sanic_response.write(closing)
+        finally:
+            for fut in futures:
+                fut.cancel()
 
-        incomings = self._parse_messages(sanic_request.body)
+    def _post_dispatch(
+            self,
+            ctx: Context,
+            incoming: Union[AnyJsonrpc, Encoded],
+            responses: List[Union[Response, Encoded]],
+            futures: List[Future],
+    ):
+        if isinstance(incoming, Encoded):
+            responses.append(incoming)
+        else:
+            self._handle_incoming(ctx(incoming), responses.append, futures.append)
+
+    async def _post_receive(
+            self,
+            ctx: Context,
+            sanic_request: SanicRequest,
+            responses: List[Union[Response, Encoded]],
+            futures: List[Future],
+    ) -> bool:
+        scanner = ArrayScanner()
+
+        while not scanner.invalid:
+            chunk = await sanic_request.stream.read()
 
-        single = not isinstance(incomings, list)
+            if chunk is None:
+                break
+
+            for element in scanner.feed(chunk):
+                self._start_timings(ctx)
+                obj = self._parse_json(element)
+                ctx.mark('decoded')
+
+                if isinstance(obj, Encoded):
+                    scanner.invalid = True
+                    break
+
+                incoming = self._parse_message(obj)
+                ctx.mark('parsed')
+                self._post_dispatch(ctx, incoming, responses, futures)
 
-        if single:
-            incomings = [incomings]
+        if scanner.is_array is False:
+            self._start_timings(ctx)
+            incomings = self._parse_messages(scanner.data, ctx)
+            single = not isinstance(incomings, list)
 
+            for incoming in [incomings] if single else incomings:
+                self._post_dispatch(ctx, incoming, responses, futures)
+
+            return single
+
+        if scanner.invalid or not scanner.closed:
+            error = PARSE_ERROR
+        elif not scanner.count:
+            error = INVALID_REQUEST
+        else:
+            return False
+
+        responses[:] = [self._encoded_error(error)]
+        futures.clear()
+        return True
+
+    async def _post(self, sanic_request: SanicRequest) -> Union[HTTPResponse, StreamingHTTPResponse]:
+        ctx = Context(self.app, sanic_request)
         responses = []
         futures = []
 
-        for incoming in incomings:
-            if isinstance(incoming, Response):
-                responses.append(incoming)
-                continue
+        if _DEADLINE_HEADER in sanic_request.headers:
+            ctx.deadline = self._parse_deadline(sanic_request.headers[_DEADLINE_HEADER])
+
+        try:
+            if self._stream_requests:
+                single = await self._post_receive(ctx, sanic_request, responses, futures)
+            else:
+                self._start_timings(ctx)
+                incomings = self._parse_messages(sanic_request.body, ctx)
+                single = not isinstance(incomings, list)
+
+                for incoming in [incomings] if single else incomings:
+                    self._post_dispatch(ctx, incoming, responses, futures)
+
+            if futures and self._stream_batches and not single:
+                streaming_fn = partial(self._post_stream, responses, futures)
+                return stream(streaming_fn, HTTPStatus.MULTI_STATUS, content_type='application/json')
 
-            if not self._handle_incoming(ctx(incoming), responses.append, futures.append):
-                continue
+            for response in await gather(*futures):
+                responses.append(response)
+        except CancelledError:
+            for fut in futures:
+                fut.cancel()
 
-        for response in await gather(*futures):
-            responses.append(response)
+            raise
 
         if responses:
-            sanic_response = json(responses[0] if single else responses, HTTPStatus.MULTI_STATUS, dumps=self._serialize)
+            body = self._encode(responses[0]) if single else self._encode_batch(responses)
+            sanic_response = HTTPResponse(body, HTTPStatus.MULTI_STATUS, content_type='application/json')
         else:
             sanic_response = HTTPResponse(status=HTTPStatus.NO_CONTENT)
 
         return sanic_response
 
+    async def _metrics_route(self, _sanic_request: SanicRequest) -> HTTPResponse:
+        return HTTPResponse(self._metrics.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+    async def _start_processing(self, app, loop):
+        await super()._start_processing(app, loop)
+
+        if self._bus is not None:
+            self._bus.open(loop)
+
+    async def _stop_processing(self, app, loop):
+        if self._bus is not None:
+            self._bus.close()
+
+        await super()._stop_processing(app, loop)
+
     async def _ws_notification(self, ctx: Context):
         try:
-            await self._run_middlewares(ctx)
+            pending = self._run_middlewares(ctx)
+
+            if pending is not None:
+                await pending
+        except CancelledError:
+            raise
         except Exception as err:
             error_logger.error("Middlewares after outgoing %r failed: %s", ctx.notification, err, exc_info=err)
         else:
             traffic_logger.debug("<-- %r", ctx.notification)
-            await self._ws_outgoing(ctx)
+            await self._ws_outgoing(ctx.websocket, ctx.notification)
+
+    @staticmethod
+    def _ws_forget(calls: Dict[Union[str, int], Future], id_: Union[str, int], task: Future):
+        if calls.get(id_) is task:
+            del calls[id_]
+
+    def _ws_cancel(self, params: Any, calls: Dict[Union[str, int], Future], failure_cb: Callable[[Encoded], None]):
+        if isinstance(params, dict):
+            id_ = params.get('id')
+        elif isinstance(params, list) and len(params) == 1:
+            id_ = params[0]
+        else:
+            id_ = None
+
+        task = calls.pop(id_, None) if isinstance(id_, (str, int)) else None
+
+        if task is None or not task.cancel():
+            logger.debug("No call %r to cancel", id_)
+            return
+
+        traffic_logger.debug("--> cancelled %r", id_)
+        failure_cb(self._encoded_error(self._cancelled_error, id_))
 
     async def _ws(self, sanic_request: SanicRequest, ws: WebSocket):
         recv = None
         pending = set()
+        calls = {}
+
+        def sender(notification: Union[Notification, Encoded]) -> Future:
+            if isinstance(notification, Encoded):
+                return self._ws_outgoing(ws, notification)
 
-        def sender(notification: Notification) -> Future:
             return ensure_future(self._ws_notification(sender_ctx(notification)))
 
-        notifier = Notifier(ws, sender, self._finalise_future)
+        def outgoing(obj: Encoded):
+            pending.add(self._ws_outgoing(ws, obj))
+
+        notifier = Notifier(ws, sender, self._finalise_future, self._ws_queue_size, self._ws_overflow)
         root_ctx = Context(self.app, sanic_request, ws, notifier)
         sender_ctx = root_ctx(Directions.outgoing)
 
-        while ws.open:
-            if recv not in pending:
-                recv = ensure_future(ws.recv())
-                pending.add(recv)
+        if self._ws_batch_size is not None and sanic_request.args.get(_BATCH_ARG, '').lower() in _BATCH_ON:
+            self._batchers[ws] = FrameBatcher(
+                partial(self._ws_send, ws), self._brackets, self._ws_batch_size, self._ws_batch_delay
+            )
 
-            try:
-                done, pending = await wait(pending, return_when=FIRST_COMPLETED)
-            except CancelledError:
-                for fut in pending:
-                    self._finalise_future(fut)
+        try:
+            while ws.open:
+                if recv not in pending and (self._ws_max_in_flight is None or len(pending) < self._ws_max_in_flight):
+                    recv = ensure_future(ws.recv())
+                    pending.add(recv)
 
-                break
+                try:
+                    done, pending = await wait(pending, return_when=FIRST_COMPLETED)
+                except CancelledError:
+                    for fut in pending:
+                        self._finalise_future(fut)
 
-            for fut in done:
-                result = self._finalise_future(fut)
+                    break
 
-                if not result:
-                    continue
+                for fut in done:
+                    result = self._finalise_future(fut)
 
-                if isinstance(result, Response):
-                    pending.add(self._ws_outgoing(root_ctx(result)))
-                    continue
+                    if not result:
+                        continue
 
-                obj = self._parse_json(result)
+                    if isinstance(result, (Response, Encoded)):
+                        pending.add(self._ws_outgoing(ws, result))
+                        continue
 
-                if isinstance(obj, Response):
-                    pending.add(self._ws_outgoing(root_ctx(obj)))
-                    continue
+                    self._start_timings(root_ctx)
+                    obj = self._parse_json(result)
+                    root_ctx.mark('decoded')
 
-                incoming = self._parse_message(obj)
+                    if isinstance(obj, Encoded):
+                        pending.add(self._ws_outgoing(ws, obj))
+                        continue
+
+                    incoming = self._parse_message(obj)
+                    root_ctx.mark('parsed')
+
+                    if isinstance(incoming, Encoded):
+                        pending.add(self._ws_outgoing(ws, incoming))
+                        continue
+
+                    ctx = root_ctx(incoming)
+
+                    if ctx.object is Objects.notification and incoming.method == _CANCEL_METHOD:
+                        self._ws_cancel(incoming.params, calls, outgoing)
+                        continue
 
-                if isinstance(incoming, Response):
-                    pending.add(self._ws_outgoing(root_ctx(incoming)))
-                    continue
+                    if _DEADLINE_FIELD in obj:
+                        ctx.deadline = self._parse_deadline(obj[_DEADLINE_FIELD])
 
-                ctx = root_ctx(incoming)
+                    task = self._handle_incoming(ctx, outgoing, pending.add)
 
-                if not self._handle_incoming(ctx, lambda x: pending.add(self._ws_outgoing(ctx(x))), pending.add):
-                    continue
+                    if task is None:
+                        continue
 
-        notifier.cancel()
+                    if ctx.object is Objects.request:
+                        calls[incoming.id] = task
+                        task.add_done_callback(partial(self._ws_forget, calls, incoming.id))
+                    elif self._ws_max_in_flight is not None:
+                        pending.add(shield(task))
+        finally:
+            notifier.cancel()
+            self._topics.unsubscribe(notifier)
+            self._batchers.pop(ws, None)
 
-        for fut in pending:
-            fut.cancel()
+            for fut in pending:
+                fut.cancel()
 
     def __init__(
             self,
@@ -151,27 +372,94 @@ class SanicJsonrpc(BaseJsonrpc):
             ws_route: Optional[str] = None,
             *,
             access_log: bool = True,
-            case_insensitive: bool = True
+            case_insensitive: bool = True,
+            codec: Optional[Codec] = None,
+            stream_batches: bool = False,
+            stream_requests: bool = False,
+            ws_max_in_flight: Optional[int] = None,
+            ws_batch_size: Optional[int] = None,
+            ws_batch_delay: float = 0,
+            ws_queue_size: Optional[int] = None,
+            ws_overflow: Overflow = Overflow.drop_oldest,
+            ipc_path: Optional[str] = None,
+            shutdown_timeout: Optional[float] = None,
+            busy_error: Error = SERVER_BUSY,
+            timeout: Optional[float] = None,
+            timeout_error: Error = REQUEST_TIMEOUT,
+            cancelled_error: Error = REQUEST_CANCELLED,
+            executor: Optional[ThreadExecutor] = None,
+            process_workers: Optional[int] = None,
+            cancel_on_disconnect: bool = False,
+            metrics: Optional[Metrics] = None,
+            metrics_route: Optional[str] = None,
+            timings_sink: Optional[TimingsSink] = None
     ):
-        super().__init__(case_insensitive=case_insensitive)
+        if metrics is None and metrics_route:
+            metrics = Metrics()
+
+        super().__init__(
+            case_insensitive=case_insensitive,
+            codec=codec,
+            shutdown_timeout=shutdown_timeout,
+            busy_error=busy_error,
+            timeout=timeout,
+            timeout_error=timeout_error,
+            cancelled_error=cancelled_error,
+            executor=executor,
+            process_workers=process_workers,
+            cancel_on_disconnect=cancel_on_disconnect,
+            metrics=metrics,
+            timings_sink=timings_sink,
+        )
         self.app = app
-        self._processing_task = None
+        self._stream_batches = stream_batches
+        self._stream_requests = stream_requests
+
+        if ws_max_in_flight is not None and ws_max_in_flight < 1:
+            raise ValueError("ws_max_in_flight must be >= 1, not {!r}".format(ws_max_in_flight))
+
+        self._ws_max_in_flight = ws_max_in_flight
+
+        if ws_batch_size is not None and ws_batch_size < 1:
+            raise ValueError("ws_batch_size must be >= 1, not {!r}".format(ws_batch_size))
+
+        self._ws_batch_size = ws_batch_size
+        self._ws_batch_delay = ws_batch_delay
+
+        if ws_queue_size is not None and ws_queue_size < 1:
+            raise ValueError("ws_queue_size must be >= 1, not {!r}".format(ws_queue_size))
+
+        self._ws_queue_size = ws_queue_size
+        self._ws_overflow = Overflow(ws_overflow)
+        self._batchers = {}  # type: Dict[WebSocket, FrameBatcher]
+        self._topics = Topics()
+        self._bus = None if ipc_path is None else Bus(ipc_path, self._bus_deliver)
         app.listener('after_server_start')(self._start_processing)
         app.listener('before_server_stop')(self._stop_processing)
 
         if post_route:
-            self.app.add_route(self._post, post_route, methods=frozenset({'POST'}))
+            if stream_requests:
+                # Sanic marks streaming handlers with an attribute, which bound methods do not accept
+                async def post(sanic_request: SanicRequest) -> Union[HTTPResponse, StreamingHTTPResponse]:
+                    return await self._post(sanic_request)
+
+                self.app.add_route(post, post_route, methods=frozenset({'POST'}), stream=True)
+            else:
+                self.app.add_route(self._post, post_route, methods=frozenset({'POST'}))
 
         if ws_route:
             self.app.add_websocket_route(self._ws, ws_route)
 
+        if metrics_route:
+            self.app.add_route(self._metrics_route, metrics_route, methods=frozenset({'GET'}))
+
         if access_log:
-            @self.middleware(Predicates.request)
+            @self.middleware(Predicates.request, executor=None)
             def set_time(req: Request, sanic_req: SanicRequest):
                 key = 'sanic_jsonrpc-time-{}'.format(req.id)
                 self._sanic_request_set(sanic_req, key, monotonic())
 
-            @self.middleware(Predicates.response)
+            @self.middleware(Predicates.response, executor=None)
             def log_response(req: Request, res: Response, sanic_req: SanicRequest):
                 key = 'sanic_jsonrpc-time-{}'.format(req.id)
                 start = self._sanic_request_pop(sanic_req, key)
@@ -182,6 +470,41 @@ class SanicJsonrpc(BaseJsonrpc):
                     'error': res.error.code if res.error is not UNSET else '',
                 })
 
+    def subscribe(self, notifier: Notifier, topic: str) -> bool:
+        return self._topics.subscribe(notifier, topic)
+
+    def unsubscribe(self, notifier: Notifier, topic: Optional[str] = None) -> bool:
+        return self._topics.unsubscribe(notifier, topic)
+
+    def subscriptions(self, notifier: Notifier) -> Set[str]:
+        return set(self._topics.topics(notifier))
+
+    def _fan_out(self, topic: str, encoded: Encoded) -> int:
+        subscribers = [n for n in self._topics.subscribers(topic) if not n.closed]
+
+        for notifier in subscribers:
+            notifier.send(encoded)
+
+        return len(subscribers)
+
+    def _bus_deliver(self, topic: str, data: bytes):
+        traffic_logger.debug("<-- bus message for %r", topic)
+        self._fan_out(topic, Encoded(data if self._binary else data.decode()))
+
+    def publish(self, topic: str, notification: Notification) -> int:
+        if self._bus is None and not self._topics.subscribers(topic):
+            return 0
+
+        encoded = Encoded(self._encode(notification))
+
+        # Oversized bus frames raise before anything is delivered locally
+        if self._bus is not None:
+            self._bus.publish(topic, encoded.data if self._binary else encoded.data.encode())
+
+        count = self._fan_out(topic, encoded)
+        traffic_logger.debug("<-- %r to %d subscribers of %r", notification, count, topic)
+        return count
+
 
 class Jsonrpc(SanicJsonrpc):
     def __init__(self, *args, **kwargs):
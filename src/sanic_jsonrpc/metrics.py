@@ -0,0 +1,112 @@
+from bisect import bisect_left
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from ._middleware import Transports
+
+__all__ = [
+    'DEFAULT_BUCKETS',
+    'Metrics',
+    'Series',
+]
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class Series:
+    __slots__ = ('bounds', 'calls', 'in_flight', 'errors', 'counts', 'sum')
+
+    def __init__(self, bounds: Tuple[float, ...]):
+        self.bounds = bounds
+        self.calls = 0
+        self.in_flight = 0
+        self.errors = {}  # type: Dict[int, int]
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+
+    @property
+    def count(self) -> int:
+        return sum(self.counts)
+
+    def enter(self):
+        self.calls += 1
+        self.in_flight += 1
+
+    def exit(self, elapsed: float, code: Optional[int] = None):
+        self.in_flight -= 1
+        self.counts[bisect_left(self.bounds, elapsed)] += 1
+        self.sum += elapsed
+
+        if code is not None:
+            self.errors[code] = self.errors.get(code, 0) + 1
+
+    def reject(self, code: int):
+        self.calls += 1
+        self.errors[code] = self.errors.get(code, 0) + 1
+
+
+class Metrics:
+    __slots__ = ('buckets', 'prefix', '_series')
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS, *, prefix: str = 'sanic_jsonrpc'):
+        self.buckets = tuple(sorted(buckets))
+        self.prefix = prefix
+        self._series = {transport: {} for transport in Transports}  # type: Dict[Transports, Dict[str, Series]]
+
+    def series(self, transport: Transports, method: str) -> Series:
+        by_method = self._series[transport]
+        series = by_method.get(method)
+
+        if series is None:
+            series = by_method[method] = Series(self.buckets)
+
+        return series
+
+    def __iter__(self) -> Iterator[Tuple[Transports, str, Series]]:
+        for transport, by_method in self._series.items():
+            for method, series in by_method.items():
+                yield transport, method, series
+
+    def render(self) -> str:
+        prefix = self.prefix
+        calls = []  # type: List[str]
+        errors = []  # type: List[str]
+        in_flight = []  # type: List[str]
+        duration = []  # type: List[str]
+
+        for transport, method, series in self:
+            labels = 'transport="{}",method="{}"'.format(transport.name, _escape(method))
+            calls.append('{}_calls_total{{{}}} {}'.format(prefix, labels, series.calls))
+            in_flight.append('{}_in_flight{{{}}} {}'.format(prefix, labels, series.in_flight))
+
+            for code, count in sorted(series.errors.items()):
+                errors.append('{}_errors_total{{{},code="{}"}} {}'.format(prefix, labels, code, count))
+
+            cumulative = 0
+
+            for bound, count in zip(self.buckets + (float('inf'),), series.counts):
+                cumulative += count
+                le = '+Inf' if bound == float('inf') else repr(bound)
+                duration.append('{}_duration_seconds_bucket{{{},le="{}"}} {}'.format(prefix, labels, le, cumulative))
+
+            duration.append('{}_duration_seconds_sum{{{}}} {!r}'.format(prefix, labels, series.sum))
+            duration.append('{}_duration_seconds_count{{{}}} {}'.format(prefix, labels, cumulative))
+
+        lines = [
+            '# HELP {}_calls_total Calls routed to a method.'.format(prefix),
+            '# TYPE {}_calls_total counter'.format(prefix),
+            *calls,
+            '# HELP {}_errors_total Calls that ended with an error, by error code.'.format(prefix),
+            '# TYPE {}_errors_total counter'.format(prefix),
+            *errors,
+            '# HELP {}_in_flight Calls currently running.'.format(prefix),
+            '# TYPE {}_in_flight gauge'.format(prefix),
+            *in_flight,
+            '# HELP {}_duration_seconds Call duration including middlewares.'.format(prefix),
+            '# TYPE {}_duration_seconds histogram'.format(prefix),
+            *duration,
+        ]
+        return '\n'.join(lines) + '\n'
@@ -1,41 +1,173 @@
-from asyncio import Future, ensure_future
-from typing import Any, Callable
+from asyncio import Future, ensure_future, get_event_loop
+from collections import deque
+from enum import Enum
+from typing import Any, Callable, Dict, Hashable, Optional, Union
 
 from websockets import WebSocketCommonProtocol as WebSocket
 
+from ._encoded import Encoded
+from .loggers import logger
 from .models import Notification
 
 __all__ = [
     'Notifier',
+    'Overflow',
 ]
 
-_Sender = Callable[[Notification], Future]
+_Sender = Callable[[Union[Notification, Encoded]], Future]
 _Finalizer = Callable[[Future], Any]
 
 
+class Overflow(Enum):
+    drop_oldest = 'drop_oldest'
+    drop_newest = 'drop_newest'
+    conflate = 'conflate'
+    disconnect = 'disconnect'
+
+
 class Notifier:
-    def __init__(self, ws: WebSocket, sender: _Sender, finalizer: _Finalizer):
+    def __init__(
+            self,
+            ws: WebSocket,
+            sender: _Sender,
+            finalizer: _Finalizer,
+            max_queue: Optional[int] = None,
+            overflow: Overflow = Overflow.drop_oldest
+    ):
         self._ws = ws
         self._sender = sender
         self._finalizer = finalizer
         self._pending = set()
+        self._queue = deque()
+        self._keys = {}  # type: Dict[Hashable, list]
+        self._writer = None  # type: Optional[Future]
+        self.max_queue = max_queue
+        self.overflow = overflow
+        self.dropped = 0
+        self.conflated = 0
 
     @property
     def closed(self) -> bool:
         return self._ws.closed
 
+    @property
+    def queued(self) -> int:
+        return len(self._queue)
+
     def _done_callback(self, fut: Future):
         self._finalizer(fut)
 
         if fut in self._pending:
             self._pending.remove(fut)
 
-    def send(self, notification: Notification) -> Future:
-        fut = self._sender(notification) if self._ws.open else ensure_future(self._ws.ensure_open())
+    def _drop(self, item: list):
+        self.dropped += 1
+        self._forget(item)
+        fut = item[1]
+
+        if not fut.done():
+            fut.set_result(False)
+
+    def _forget(self, item: list):
+        key = item[3]
+
+        if key is not None and self._keys.get(key) is item:
+            del self._keys[key]
+
+    def _overflow(self, method: Optional[str]) -> bool:
+        overflow = self.overflow
+
+        if overflow is Overflow.drop_newest:
+            return False
+
+        if overflow is Overflow.disconnect:
+            logger.warning("Closing slow consumer with %d queued notifications", len(self._queue))
+            ensure_future(self._ws.close(1008, "Slow consumer"))
+
+            while self._queue:
+                self._drop(self._queue.popleft())
+
+            return False
+
+        if overflow is Overflow.conflate and method is not None:
+            for item in reversed(self._queue):
+                if item[2] == method:
+                    self._queue.remove(item)
+                    self._drop(item)
+                    return True
+
+        self._drop(self._queue.popleft())
+        return True
+
+    async def _write(self):
+        queue = self._queue
+
+        while queue:
+            item = queue.popleft()
+            self._forget(item)
+            payload, fut, _, _ = item
+
+            if fut.done():
+                continue
+
+            try:
+                await self._sender(payload)
+            except Exception as err:
+                if not fut.done():
+                    fut.set_exception(err)
+            else:
+                if not fut.done():
+                    fut.set_result(True)
+
+    def _enqueue(self, payload: Union[Notification, Encoded], conflate: Optional[Hashable]) -> Future:
+        fut = get_event_loop().create_future()
+        method = payload.method if isinstance(payload, Notification) else None
+        item = self._keys.get(conflate) if conflate is not None else None
+
+        if item is not None:
+            self.conflated += 1
+            old = item[1]
+            item[:3] = payload, fut, method
+
+            if not old.done():
+                old.set_result(False)
+
+            return fut
+
+        item = [payload, fut, method, conflate]
+
+        if self.max_queue is not None and len(self._queue) >= self.max_queue and not self._overflow(method):
+            self._drop(item)
+            return fut
+
+        self._queue.append(item)
+
+        if conflate is not None:
+            self._keys[conflate] = item
+
+        if self._writer is None or self._writer.done():
+            self._writer = ensure_future(self._write())
+
+        return fut
+
+    def send(self, notification: Union[Notification, Encoded], conflate: Optional[Hashable] = None) -> Future:
+        if not self._ws.open:
+            fut = ensure_future(self._ws.ensure_open())
+        elif self.max_queue is None and conflate is None and not self._queue:
+            fut = self._sender(notification)
+        else:
+            fut = self._enqueue(notification, conflate)
+
         fut.add_done_callback(self._done_callback)
         self._pending.add(fut)
         return fut
 
     def cancel(self):
+        if self._writer is not None:
+            self._writer.cancel()
+
+        self._queue.clear()
+        self._keys.clear()
+
         for fut in self._pending:
             fut.cancel()
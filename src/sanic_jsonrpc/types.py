@@ -1,13 +1,18 @@
-from typing import Union
+from typing import Any, Callable, List, Tuple, Union
 
+from ._middleware import Transports
 from .models import Notification, Request, Response
 
 __all__ = [
     'AnyJsonrpc',
     'Incoming',
     'Outgoing',
+    'Timings',
+    'TimingsSink',
 ]
 
 Incoming = Union[Request, Notification]
 Outgoing = Union[Response, Notification]
 AnyJsonrpc = Union[Incoming, Outgoing]
+Timings = List[Tuple[str, float]]
+TimingsSink = Callable[[Transports, Incoming, Timings], Any]
@@ -0,0 +1,75 @@
+from asyncio import TimeoutError, sleep, wait_for
+from logging import DEBUG
+from typing import Optional
+
+from pytest import fixture, mark, raises
+from sanic import Sanic
+from sanic.websocket import WebSocketProtocol
+from ujson import dumps, loads
+
+from sanic_jsonrpc import SanicJsonrpc
+
+Sanic.test_mode = True
+
+
+@fixture(params=[None, 1, 2])
+def ws_max_in_flight(request):
+    return request.param
+
+
+@fixture
+def app(ws_max_in_flight):
+    app_ = Sanic('sanic-jsonrpc')
+    jsonrpc = SanicJsonrpc(app_, '/post', '/ws', ws_max_in_flight=ws_max_in_flight)
+    stats = {'running': 0, 'peak': 0}
+
+    @jsonrpc
+    async def track():
+        stats['running'] += 1
+        stats['peak'] = max(stats['peak'], stats['running'])
+        await sleep(0.02)
+        stats['running'] -= 1
+
+    @jsonrpc
+    async def peak() -> int:
+        return stats['peak']
+
+    return app_
+
+
+@fixture
+def test_cli_ws(loop, app, sanic_client):
+    return loop.run_until_complete(sanic_client(app, scheme='ws', protocol=WebSocketProtocol))
+
+
+@mark.parametrize('requests', [6])
+async def test_ws(caplog, ws_max_in_flight: Optional[int], test_cli_ws, requests: int):
+    caplog.set_level(DEBUG)
+    ws = await test_cli_ws.ws_connect('/ws')
+
+    for i in range(requests):
+        data = {'jsonrpc': '2.0', 'method': 'track', 'id': i} if i % 2 else {'jsonrpc': '2.0', 'method': 'track'}
+        await ws.send(dumps(data)) if hasattr(ws, 'send') else await ws.send_json(data)
+
+    data = {'jsonrpc': '2.0', 'method': 'peak', 'id': 'peak'}
+    await ws.send(dumps(data)) if hasattr(ws, 'send') else await ws.send_json(data)
+    left = []
+
+    while True:
+        try:
+            message = await wait_for(ws.recv(), 0.2) if hasattr(ws, 'recv') else await ws.receive_str(timeout=0.2)
+        except TimeoutError:
+            break
+
+        left.append(loads(message))
+
+    await ws.close()
+    await test_cli_ws.close()
+
+    assert sorted(m['id'] for m in left if m['id'] != 'peak') == [i for i in range(requests) if i % 2]
+    assert [m['result'] for m in left if m['id'] == 'peak'] == [ws_max_in_flight or requests]
+
+
+def test_invalid():
+    with raises(ValueError):
+        SanicJsonrpc(Sanic('sanic-jsonrpc-invalid'), ws_max_in_flight=0)
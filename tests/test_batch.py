@@ -0,0 +1,108 @@
+from asyncio import TimeoutError, wait_for
+from logging import DEBUG
+from typing import List
+
+from pytest import fixture, mark, raises
+from sanic import Sanic
+from sanic.websocket import WebSocketProtocol
+from ujson import dumps, loads
+
+from sanic_jsonrpc import Notification, Notifier, SanicJsonrpc
+
+Sanic.test_mode = True
+
+
+@fixture
+def batch_delay():
+    return 0.02
+
+
+@fixture
+def app(batch_delay: float):
+    app_ = Sanic('sanic-jsonrpc')
+    jsonrpc = SanicJsonrpc(app_, '/post', '/ws', ws_batch_size=3, ws_batch_delay=batch_delay)
+
+    @jsonrpc
+    def echo(value: int) -> int:
+        return value
+
+    @jsonrpc
+    def shout(notifier: Notifier, value: int):
+        notifier.send(Notification('shouted', [value]))
+
+    return app_
+
+
+@fixture
+def test_cli_ws(loop, app, sanic_client):
+    return loop.run_until_complete(sanic_client(app, scheme='ws', protocol=WebSocketProtocol))
+
+
+@mark.parametrize('path,batched', [
+    ('/ws?batch=1', True),
+    ('/ws?batch=true', True),
+    ('/ws', False),
+    ('/ws?batch=0', False),
+    ('/ws?batch=false', False),
+])
+async def test_ws(caplog, test_cli_ws, path: str, batched: bool):
+    caplog.set_level(DEBUG)
+    ws = await test_cli_ws.ws_connect(path)
+    in_ = [{'jsonrpc': '2.0', 'method': 'echo', 'params': [i], 'id': i} for i in range(7)]
+    in_.append({'jsonrpc': '2.0', 'method': 'shout', 'params': [7]})
+    await ws.send(dumps(in_[0])) if hasattr(ws, 'send') else await ws.send_json(in_[0])
+    frames = []
+
+    while True:
+        try:
+            frame = await wait_for(ws.recv(), 0.1) if hasattr(ws, 'recv') else await ws.receive_str(timeout=0.1)
+        except TimeoutError:
+            break
+
+        frames.append(loads(frame))
+
+    for data in in_[1:]:
+        await ws.send(dumps(data)) if hasattr(ws, 'send') else await ws.send_json(data)
+
+    while True:
+        try:
+            frame = await wait_for(ws.recv(), 0.1) if hasattr(ws, 'recv') else await ws.receive_str(timeout=0.1)
+        except TimeoutError:
+            break
+
+        frames.append(loads(frame))
+
+    await ws.close()
+    await test_cli_ws.close()
+
+    messages = []  # type: List[dict]
+
+    for frame in frames:
+        messages.extend(frame if isinstance(frame, list) else [frame])
+
+    assert frames[0] == {'jsonrpc': '2.0', 'result': 0, 'id': 0}
+    assert sorted(m['id'] for m in messages if 'id' in m) == list(range(7))
+    assert [m for m in messages if 'id' not in m] == [{'jsonrpc': '2.0', 'method': 'shouted', 'params': [7]}]
+    assert all(len(f) <= 3 for f in frames if isinstance(f, list))
+    assert (len(frames) < len(messages)) is batched
+
+
+def test_invalid():
+    with raises(ValueError):
+        SanicJsonrpc(Sanic('sanic-jsonrpc-invalid'), ws_batch_size=0)
+
+
+@mark.parametrize('batch_delay', [0.5])
+async def test_full_batch(caplog, test_cli_ws):
+    caplog.set_level(DEBUG)
+    ws = await test_cli_ws.ws_connect('/ws?batch=1')
+
+    for i in range(3):
+        await ws.send(dumps({'jsonrpc': '2.0', 'method': 'echo', 'params': [i], 'id': i}))
+
+    frame = loads(await wait_for(ws.recv(), 0.2))
+
+    assert sorted(m['id'] for m in frame) == [0, 1, 2]
+
+    await ws.close()
+    await test_cli_ws.close()
@@ -0,0 +1,188 @@
+from asyncio import iscoroutine, sleep
+from logging import DEBUG
+from typing import Dict, List
+
+from pytest import fixture, mark
+from sanic import Sanic
+
+from sanic_jsonrpc import Cache, Predicates, RawJson, Request, Response, SanicJsonrpc
+
+Sanic.test_mode = True
+
+cache = Cache(60, max_size=2)
+
+
+@fixture
+def results():
+    return []
+
+
+@fixture
+def app(results: list):
+    app_ = Sanic('sanic-jsonrpc')
+    jsonrpc = SanicJsonrpc(app_, '/post', '/ws')
+    calls = {'counted': 0, 'expiring': 0}
+    cache.invalidate()
+
+    @jsonrpc.middleware(Predicates.response)
+    def record(req: Request, res: Response):
+        if req.method == 'expiring':
+            results.append(res.result)
+
+    @jsonrpc.middleware(Predicates.response)
+    def stamp(req: Request, res: Response):
+        if req.method == 'stamped':
+            res.result['stamp'] = req.id
+
+    @jsonrpc(cache_=cache)
+    def counted(*values: int) -> List[int]:
+        calls['counted'] += 1
+        return [calls['counted'], *values]
+
+    @jsonrpc(cache_=0.05)
+    def expiring() -> int:
+        calls['expiring'] += 1
+        return calls['expiring']
+
+    @jsonrpc(cache_=cache)
+    def stamped() -> Dict[str, int]:
+        return {'value': 1}
+
+    @jsonrpc
+    def invalidate() -> int:
+        count = len(cache)
+        cache.invalidate('counted')
+        return count
+
+    @jsonrpc
+    async def wait() -> bool:
+        await sleep(0.1)
+        return True
+
+    return app_
+
+
+@fixture
+def test_cli(loop, app, sanic_client):
+    return loop.run_until_complete(sanic_client(app))
+
+
+@mark.parametrize('in_,out', [(
+    [
+        {'jsonrpc': '2.0', 'method': 'counted', 'params': [1], 'id': 1},
+        {'jsonrpc': '2.0', 'method': 'counted', 'params': [1], 'id': 2},
+        {'jsonrpc': '2.0', 'method': 'counted', 'params': [2], 'id': 3},
+        {'jsonrpc': '2.0', 'method': 'counted', 'params': [1], 'id': 4},
+    ],
+    [
+        [{'jsonrpc': '2.0', 'result': [1, 1], 'id': 1}],
+        [{'jsonrpc': '2.0', 'result': [1, 1], 'id': 2}],
+        [{'jsonrpc': '2.0', 'result': [2, 2], 'id': 3}],
+        [{'jsonrpc': '2.0', 'result': [1, 1], 'id': 4}],
+    ]
+), (
+    [
+        {'jsonrpc': '2.0', 'method': 'counted', 'params': [1], 'id': 1},
+        {'jsonrpc': '2.0', 'method': 'counted', 'params': [2], 'id': 2},
+        {'jsonrpc': '2.0', 'method': 'counted', 'params': [3], 'id': 3},
+        {'jsonrpc': '2.0', 'method': 'counted', 'params': [2], 'id': 4},
+        {'jsonrpc': '2.0', 'method': 'counted', 'params': [1], 'id': 5},
+    ],
+    [
+        [{'jsonrpc': '2.0', 'result': [1, 1], 'id': 1}],
+        [{'jsonrpc': '2.0', 'result': [2, 2], 'id': 2}],
+        [{'jsonrpc': '2.0', 'result': [3, 3], 'id': 3}],
+        [{'jsonrpc': '2.0', 'result': [2, 2], 'id': 4}],
+        [{'jsonrpc': '2.0', 'result': [4, 1], 'id': 5}],
+    ]
+), (
+    [
+        {'jsonrpc': '2.0', 'method': 'counted', 'id': 1},
+        {'jsonrpc': '2.0', 'method': 'counted'},
+        {'jsonrpc': '2.0', 'method': 'invalidate', 'id': 2},
+        {'jsonrpc': '2.0', 'method': 'counted', 'id': 3},
+    ],
+    [
+        [{'jsonrpc': '2.0', 'result': [1], 'id': 1}],
+        None,
+        [{'jsonrpc': '2.0', 'result': 1, 'id': 2}],
+        [{'jsonrpc': '2.0', 'result': [3], 'id': 3}],
+    ]
+), (
+    [
+        {'jsonrpc': '2.0', 'method': 'expiring', 'id': 1},
+        {'jsonrpc': '2.0', 'method': 'expiring', 'id': 2},
+        {'jsonrpc': '2.0', 'method': 'wait', 'id': 3},
+        {'jsonrpc': '2.0', 'method': 'expiring', 'id': 4},
+    ],
+    [
+        [{'jsonrpc': '2.0', 'result': 1, 'id': 1}],
+        [{'jsonrpc': '2.0', 'result': 1, 'id': 2}],
+        [{'jsonrpc': '2.0', 'result': True, 'id': 3}],
+        [{'jsonrpc': '2.0', 'result': 2, 'id': 4}],
+    ]
+)])
+async def test_post(caplog, test_cli, in_: List[dict], out: List[list]):
+    caplog.set_level(DEBUG)
+
+    for message, expected in zip(in_, out):
+        response = await test_cli.post('/post', json=[message])
+
+        if expected is None:
+            continue
+
+        data = response.json()
+        data = (await data) if iscoroutine(data) else data
+
+        assert data == expected
+
+
+async def test_middleware(caplog, test_cli, results: list):
+    caplog.set_level(DEBUG)
+
+    for i in range(2):
+        response = await test_cli.post('/post', json={'jsonrpc': '2.0', 'method': 'expiring', 'id': i})
+        data = response.json()
+        data = (await data) if iscoroutine(data) else data
+
+        assert data == {'jsonrpc': '2.0', 'result': 1, 'id': i}
+
+    assert results == [1, 1]
+
+
+async def test_mutating_middleware(caplog, test_cli):
+    caplog.set_level(DEBUG)
+
+    for i in range(2):
+        response = await test_cli.post('/post', json={'jsonrpc': '2.0', 'method': 'stamped', 'id': i})
+        data = response.json()
+        data = (await data) if iscoroutine(data) else data
+
+        assert data == {'jsonrpc': '2.0', 'result': {'value': 1, 'stamp': i}, 'id': i}
+
+
+def test_keys():
+    assert Cache.key('method', {'a': 1, 'b': [2]}) == Cache.key('method', {'b': [2], 'a': 1})
+    assert Cache.key('method', [True]) != Cache.key('method', [1])
+    assert Cache.key('method', [1]) != Cache.key('other', [1])
+    assert Cache.key('method', [1]) != Cache.key('method', {'0': 1})
+
+
+def test_memory():
+    memory = Cache(60, max_size=None, max_memory=8)
+    memory.set(Cache.key('a'), RawJson('1234'))
+    memory.set(Cache.key('b'), RawJson('5678'))
+    assert len(memory) == 2 and memory.memory == 8
+
+    memory.get(Cache.key('a'))
+    memory.set(Cache.key('c'), RawJson('90'))
+    assert memory.get(Cache.key('b')) is None
+    assert memory.get(Cache.key('a')) == RawJson('1234')
+    assert memory.memory == 6
+
+    memory.set(Cache.key('e'), RawJson('"é"'))
+    assert len(memory) == 2 and memory.memory == 8
+
+    memory.set(Cache.key('d'), RawJson('too large'))
+    assert memory.get(Cache.key('d')) is None
+    assert (memory.hits, memory.misses) == (2, 2)
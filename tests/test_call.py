@@ -46,6 +46,10 @@ def app():
     async def long_operation():
         await sleep(0.1)
 
+    @jsonrpc
+    def in_flight() -> int:
+        return jsonrpc.in_flight
+
     return app_
 
 
@@ -78,6 +82,15 @@ def test_cli(loop, app, sanic_client):
         {'jsonrpc': '2.0', 'method': 'long_operation'},
     ],
     None
+), (
+    [
+        {'jsonrpc': '2.0', 'method': 'awaitable', 'id': 7},
+        {'jsonrpc': '2.0', 'method': 'in_flight', 'id': 8},
+    ],
+    [
+        {'jsonrpc': '2.0', 'result': 'awaitable', 'id': 7},
+        {'jsonrpc': '2.0', 'result': 2, 'id': 8},
+    ]
 )])
 async def test_call(caplog, test_cli, in_: dict, out: dict):
     caplog.set_level(DEBUG)
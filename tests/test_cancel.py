@@ -0,0 +1,93 @@
+from asyncio import CancelledError, TimeoutError, sleep, wait_for
+from functools import partial
+from logging import DEBUG, ERROR
+from operator import contains
+from typing import List
+
+from pytest import fixture, mark
+from sanic import Sanic
+from sanic.websocket import WebSocketProtocol
+from ujson import dumps, loads
+
+from sanic_jsonrpc import SanicJsonrpc
+
+Sanic.test_mode = True
+
+CANCELLED = {'code': -32800, 'message': "Request cancelled"}
+
+
+def lists_equal_unordered(self: list, other: list) -> bool:
+    return all(map(partial(contains, other), self)) and all(map(partial(contains, self), other))
+
+
+@fixture
+def app():
+    app_ = Sanic('sanic-jsonrpc')
+    jsonrpc = SanicJsonrpc(app_, '/post', '/ws')
+    events = []
+
+    @jsonrpc
+    async def slow(name: str) -> str:
+        try:
+            await sleep(0.2)
+        except CancelledError:
+            events.append('cancelled ' + name)
+            raise
+
+        return name
+
+    @jsonrpc
+    async def history() -> List[str]:
+        return sorted(events)
+
+    return app_
+
+
+@fixture
+def test_cli_ws(loop, app, sanic_client):
+    return loop.run_until_complete(sanic_client(app, scheme='ws', protocol=WebSocketProtocol))
+
+
+@mark.parametrize('in_,out', [(
+    [
+        {'jsonrpc': '2.0', 'method': 'slow', 'params': ['a'], 'id': 1},
+        {'jsonrpc': '2.0', 'method': 'slow', 'params': ['b'], 'id': 'b'},
+        {'jsonrpc': '2.0', 'method': 'slow', 'params': ['c'], 'id': 3},
+        {'jsonrpc': '2.0', 'method': '$/cancelRequest', 'params': {'id': 1}},
+        {'jsonrpc': '2.0', 'method': '$/cancelRequest', 'params': ['b']},
+        {'jsonrpc': '2.0', 'method': '$/cancelRequest', 'params': {'id': 4}},
+        {'jsonrpc': '2.0', 'method': '$/cancelRequest', 'params': {'id': 1}},
+        {'jsonrpc': '2.0', 'method': '$/cancelRequest'},
+    ],
+    [
+        {'jsonrpc': '2.0', 'error': CANCELLED, 'id': 1},
+        {'jsonrpc': '2.0', 'error': CANCELLED, 'id': 'b'},
+        {'jsonrpc': '2.0', 'result': 'c', 'id': 3},
+        {'jsonrpc': '2.0', 'result': ['cancelled a', 'cancelled b'], 'id': 0},
+    ]
+)])
+async def test_ws(caplog, test_cli_ws, in_: List[dict], out: List[dict]):
+    caplog.set_level(DEBUG)
+    ws = await test_cli_ws.ws_connect('/ws')
+
+    for data in in_:
+        await ws.send(dumps(data)) if hasattr(ws, 'send') else await ws.send_json(data)
+
+    await sleep(0.3)
+    data = {'jsonrpc': '2.0', 'method': 'history', 'id': 0}
+    await ws.send(dumps(data)) if hasattr(ws, 'send') else await ws.send_json(data)
+    left = []
+
+    while True:
+        try:
+            message = await wait_for(ws.recv(), 0.1) if hasattr(ws, 'recv') else await ws.receive_str(timeout=0.1)
+        except TimeoutError:
+            break
+
+        left.append(loads(message))
+
+    await ws.close()
+    await test_cli_ws.close()
+
+    assert len(left) == len(out) and lists_equal_unordered(left, out)
+    assert not [r for r in caplog.records if r.levelno >= ERROR]
@@ -0,0 +1,154 @@
+from asyncio import TimeoutError, iscoroutine, sleep, wait_for
+from functools import partial
+from logging import DEBUG
+from operator import contains
+from typing import Dict, List
+
+from pytest import fixture, mark
+from sanic import Sanic
+from sanic.websocket import WebSocketProtocol
+from ujson import dumps, loads
+
+from sanic_jsonrpc import Predicates, Request, Response, SanicJsonrpc
+
+Sanic.test_mode = True
+
+
+def lists_equal_unordered(self: list, other: list) -> bool:
+    return all(map(partial(contains, other), self)) and all(map(partial(contains, self), other))
+
+
+@fixture
+def results():
+    return []
+
+
+@fixture
+def app(results: list):
+    app_ = Sanic('sanic-jsonrpc')
+    jsonrpc = SanicJsonrpc(app_, '/post', '/ws')
+    calls = {'shared': 0, 'single': 0}
+
+    @jsonrpc.middleware(Predicates.response)
+    def record(req: Request, res: Response):
+        if req.method == 'shared':
+            results.append(res.result)
+
+    @jsonrpc.middleware(Predicates.response)
+    def stamp(req: Request, res: Response):
+        if req.method == 'stamped':
+            res.result['stamp'] = req.id
+
+    @jsonrpc(coalesce_=True)
+    async def shared(value: int) -> List[int]:
+        calls['shared'] += 1
+        count = calls['shared']
+        await sleep(0.02)
+        return [value, count]
+
+    @jsonrpc(coalesce_=True)
+    async def stamped() -> Dict[str, int]:
+        await sleep(0.02)
+        return {'value': 1}
+
+    @jsonrpc
+    async def single(value: int) -> List[int]:
+        calls['single'] += 1
+        count = calls['single']
+        await sleep(0.02)
+        return [value, count]
+
+    return app_
+
+
+@fixture
+def test_cli(loop, app, sanic_client):
+    return loop.run_until_complete(sanic_client(app))
+
+
+@fixture
+def test_cli_ws(loop, app, sanic_client):
+    return loop.run_until_complete(sanic_client(app, scheme='ws', protocol=WebSocketProtocol))
+
+
+@mark.parametrize('in_,out', [(
+    [
+        {'jsonrpc': '2.0', 'method': 'shared', 'params': [1], 'id': 1},
+        {'jsonrpc': '2.0', 'method': 'shared', 'params': {'value': 1}, 'id': 2},
+        {'jsonrpc': '2.0', 'method': 'shared', 'params': [1], 'id': 3},
+        {'jsonrpc': '2.0', 'method': 'shared', 'params': [2], 'id': 4},
+        {'jsonrpc': '2.0', 'method': 'shared', 'params': [1], 'id': 5},
+        {'jsonrpc': '2.0', 'method': 'shared', 'params': ['a'], 'id': 6},
+        {'jsonrpc': '2.0', 'method': 'shared', 'params': ['a'], 'id': 7},
+    ],
+    [
+        {'jsonrpc': '2.0', 'result': [1, 1], 'id': 1},
+        {'jsonrpc': '2.0', 'result': [1, 2], 'id': 2},
+        {'jsonrpc': '2.0', 'result': [1, 1], 'id': 3},
+        {'jsonrpc': '2.0', 'result': [2, 3], 'id': 4},
+        {'jsonrpc': '2.0', 'result': [1, 1], 'id': 5},
+        {'jsonrpc': '2.0', 'error': {'code': -32602, 'message': "Invalid params"}, 'id': 6},
+        {'jsonrpc': '2.0', 'error': {'code': -32602, 'message': "Invalid params"}, 'id': 7},
+    ]
+), (
+    [
+        {'jsonrpc': '2.0', 'method': 'single', 'params': [1], 'id': 1},
+        {'jsonrpc': '2.0', 'method': 'single', 'params': [1], 'id': 2},
+    ],
+    [
+        {'jsonrpc': '2.0', 'result': [1, 1], 'id': 1},
+        {'jsonrpc': '2.0', 'result': [1, 2], 'id': 2},
+    ]
+)])
+async def test_post(caplog, test_cli, in_: List[dict], out: List[dict]):
+    caplog.set_level(DEBUG)
+    response = await test_cli.post('/post', json=in_)
+    data = response.json()
+    data = (await data) if iscoroutine(data) else data
+
+    assert lists_equal_unordered(data, out)
+
+
+async def test_ws(caplog, test_cli_ws):
+    caplog.set_level(DEBUG)
+    sockets = [await test_cli_ws.ws_connect('/ws') for _ in range(3)]
+
+    for i, ws in enumerate(sockets):
+        data = {'jsonrpc': '2.0', 'method': 'shared', 'params': [7], 'id': i}
+        await ws.send(dumps(data)) if hasattr(ws, 'send') else await ws.send_json(data)
+
+    for i, ws in enumerate(sockets):
+        try:
+            message = await wait_for(ws.recv(), 0.5) if hasattr(ws, 'recv') else await ws.receive_str(timeout=0.5)
+        except TimeoutError:
+            message = None
+
+        assert loads(message) == {'jsonrpc': '2.0', 'result': [7, 1], 'id': i}
+        await ws.close()
+
+    await test_cli_ws.close()
+
+
+async def test_middleware(caplog, test_cli, results: list):
+    caplog.set_level(DEBUG)
+    await test_cli.post('/post', json=[
+        {'jsonrpc': '2.0', 'method': 'shared', 'params': [1], 'id': 1},
+        {'jsonrpc': '2.0', 'method': 'shared', 'params': [1], 'id': 2},
+    ])
+
+    assert results == [[1, 1], [1, 1]]
+
+
+async def test_mutating_middleware(caplog, test_cli):
+    caplog.set_level(DEBUG)
+    response = await test_cli.post('/post', json=[
+        {'jsonrpc': '2.0', 'method': 'stamped', 'id': 1},
+        {'jsonrpc': '2.0', 'method': 'stamped', 'id': 2},
+    ])
+    data = response.json()
+    data = (await data) if iscoroutine(data) else data
+
+    assert lists_equal_unordered(data, [
+        {'jsonrpc': '2.0', 'result': {'value': 1, 'stamp': 1}, 'id': 1},
+        {'jsonrpc': '2.0', 'result': {'value': 1, 'stamp': 2}, 'id': 2},
+    ])
@@ -0,0 +1,189 @@
+from asyncio import TimeoutError, iscoroutine, wait_for
+from functools import partial
+from logging import DEBUG
+from operator import contains
+from typing import List
+
+from pytest import fixture, importorskip, mark, raises
+from sanic import Sanic
+from sanic.websocket import WebSocketProtocol
+from ujson import dumps, loads
+
+from sanic_jsonrpc import Codec, Error, RawJson, SanicJsonrpc
+
+Sanic.test_mode = True
+
+
+def lists_equal_unordered(self: list, other: list) -> bool:
+    return all(map(partial(contains, other), self)) and all(map(partial(contains, self), other))
+
+
+@fixture(params=['ujson', 'json', 'orjson', 'msgspec'])
+def codec(request):
+    if request.param in {'orjson', 'msgspec'}:
+        importorskip(request.param)
+
+    return getattr(Codec, request.param)()
+
+
+@fixture
+def app(codec):
+    app_ = Sanic('sanic-jsonrpc')
+    jsonrpc = SanicJsonrpc(app_, '/post', '/ws', codec=codec)
+
+    @jsonrpc
+    def echo(*params: str) -> List[str]:
+        return list(params)
+
+    @jsonrpc
+    def number(value: int) -> int:
+        return value
+
+    @jsonrpc
+    def raw_str() -> RawJson:
+        return RawJson('{"raw": ["str", 1]}')
+
+    @jsonrpc
+    def raw_bytes() -> RawJson:
+        return RawJson(b'[true, null]')
+
+    @jsonrpc
+    def raw_number() -> RawJson:
+        return RawJson(123)
+
+    @jsonrpc
+    def raw_undecodable() -> RawJson:
+        return RawJson(b'\xff')
+
+    @jsonrpc
+    def error():
+        raise Error(-1, "Error", {'data': [1, 2]})
+
+    return app_
+
+
+@fixture
+def test_cli(loop, app, sanic_client):
+    return loop.run_until_complete(sanic_client(app))
+
+
+@fixture
+def test_cli_ws(loop, app, sanic_client):
+    return loop.run_until_complete(sanic_client(app, scheme='ws', protocol=WebSocketProtocol))
+
+
+@mark.parametrize('in_,out', [(
+    '{"jsonrpc": "2.0", "method": "echo", "params": ["a", "b"], "id": 1}',
+    {'jsonrpc': '2.0', 'result': ['a', 'b'], 'id': 1}
+), (
+    '{"jsonrpc": "2.0", "method": "error", "id": 2}',
+    {'jsonrpc': '2.0', 'error': {'code': -1, 'message': "Error", 'data': {'data': [1, 2]}}, 'id': 2}
+), (
+    '[{"jsonrpc": "2.0", "method": "echo", "params": ["c"], "id": 3}]',
+    [{'jsonrpc': '2.0', 'result': ['c'], 'id': 3}]
+), (
+    '{"jsonrpc": "2.0", "method": "echo", "params": [',
+    {'jsonrpc': '2.0', 'error': {'code': -32700, 'message': "Parse error"}, 'id': None}
+), (
+    '{"jsonrpc": "2.0", "method": "missing", "id": "4"}',
+    {'jsonrpc': '2.0', 'error': {'code': -32601, 'message': "Method not found"}, 'id': '4'}
+), (
+    '{"jsonrpc": "2.0", "method": "number", "params": ["five"], "id": 5}',
+    {'jsonrpc': '2.0', 'error': {'code': -32602, 'message': "Invalid params"}, 'id': 5}
+), (
+    '[{"jsonrpc": "2.0", "method": "missing", "id": 6}, 7]',
+    [
+        {'jsonrpc': '2.0', 'error': {'code': -32601, 'message': "Method not found"}, 'id': 6},
+        {'jsonrpc': '2.0', 'error': {'code': -32600, 'message': "Invalid Request"}, 'id': None},
+    ]
+), (
+    '{"jsonrpc": "2.0", "method": "raw_str", "id": 8}',
+    {'jsonrpc': '2.0', 'result': {'raw': ['str', 1]}, 'id': 8}
+), (
+    '[{"jsonrpc": "2.0", "method": "raw_str", "id": 9}, {"jsonrpc": "2.0", "method": "raw_bytes", "id": "10"}]',
+    [
+        {'jsonrpc': '2.0', 'result': {'raw': ['str', 1]}, 'id': 9},
+        {'jsonrpc': '2.0', 'result': [True, None], 'id': '10'},
+    ]
+), (
+    '[{"jsonrpc": "2.0", "method": "raw_number", "id": 11}, {"jsonrpc": "2.0", "method": "echo", "id": 12}]',
+    [
+        {'jsonrpc': '2.0', 'error': {'code': -32603, 'message': "Internal error"}, 'id': 11},
+        {'jsonrpc': '2.0', 'result': [], 'id': 12},
+    ]
+)])
+async def test_post(caplog, test_cli, in_: str, out: dict):
+    caplog.set_level(DEBUG)
+    try:
+        response = await test_cli.post('/post', content=in_)
+    except TypeError:
+        response = await test_cli.post('/post', data=in_)
+
+    data = response.json()
+    data = (await data) if iscoroutine(data) else data
+
+    assert data == out
+
+
+@mark.parametrize('in_,out', [(
+    [
+        {'jsonrpc': '2.0', 'method': 'echo', 'params': ['a', 'b'], 'id': 1},
+        {'jsonrpc': '2.0', 'method': 'error', 'id': 2},
+        {'jsonrpc': '2.0', 'method': 'raw_str', 'id': 3},
+        {'jsonrpc': '2.0', 'method': 'raw_bytes', 'id': 4},
+        {'jsonrpc': '2.0', 'method': 'raw_number', 'id': 5},
+    ], [
+        {'jsonrpc': '2.0', 'result': ['a', 'b'], 'id': 1},
+        {'jsonrpc': '2.0', 'error': {'code': -1, 'message': "Error", 'data': {'data': [1, 2]}}, 'id': 2},
+        {'jsonrpc': '2.0', 'result': {'raw': ['str', 1]}, 'id': 3},
+        {'jsonrpc': '2.0', 'result': [True, None], 'id': 4},
+        {'jsonrpc': '2.0', 'error': {'code': -32603, 'message': "Internal error"}, 'id': 5},
+    ]
+)])
+async def test_ws(caplog, test_cli_ws, in_: List[dict], out: List[dict]):
+    caplog.set_level(DEBUG)
+    ws = await test_cli_ws.ws_connect('/ws')
+
+    for data in in_:
+        await ws.send(dumps(data)) if hasattr(ws, 'send') else await ws.send_json(data)
+
+    left = []
+
+    while True:
+        try:
+            message = await wait_for(ws.recv(), 0.05) if hasattr(ws, 'recv') else await ws.receive_str(timeout=0.05)
+        except TimeoutError:
+            break
+
+        assert isinstance(message, str)
+        left.append(loads(message))
+
+    await ws.close()
+    await test_cli_ws.close()
+
+    assert lists_equal_unordered(left, out)
+
+
+@mark.parametrize('codec', [Codec.ujson(), Codec.json()])
+async def test_raw_encode_failure(caplog, test_cli_ws):
+    caplog.set_level(DEBUG)
+    ws = await test_cli_ws.ws_connect('/ws')
+
+    for i, method in enumerate(['raw_undecodable', 'raw_str']):
+        await ws.send(dumps({'jsonrpc': '2.0', 'method': method, 'id': i}))
+
+    left = [loads(await wait_for(ws.recv(), 1)) for _ in range(2)]
+
+    await ws.close()
+    await test_cli_ws.close()
+
+    assert lists_equal_unordered(left, [
+        {'jsonrpc': '2.0', 'error': {'code': -32603, 'message': "Internal error"}, 'id': 0},
+        {'jsonrpc': '2.0', 'result': {'raw': ['str', 1]}, 'id': 1},
+    ])
+    assert "Failed to encode raw result" in caplog.text
+
+
+def test_raw_type():
+    with raises(TypeError):
+        RawJson(123)
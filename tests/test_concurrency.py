@@ -0,0 +1,81 @@
+from asyncio import iscoroutine, sleep
+from http import HTTPStatus
+from logging import DEBUG
+
+from pytest import fixture, mark
+from sanic import Sanic
+
+from sanic_jsonrpc import Error, SanicJsonrpc
+
+Sanic.test_mode = True
+
+
+@fixture
+def app():
+    app_ = Sanic('sanic-jsonrpc')
+    jsonrpc = SanicJsonrpc(app_, '/post', '/ws', busy_error=Error(-32099, "Too busy"))
+    running = {'queued': 0, 'unbounded': 0}
+    peaks = {'queued': 0, 'unbounded': 0}
+
+    async def track(name: str) -> int:
+        running[name] += 1
+        peaks[name] = max(peaks[name], running[name])
+        await sleep(0.02)
+        running[name] -= 1
+        return peaks[name]
+
+    @jsonrpc(max_concurrency_=1, max_queue_=1)
+    async def queued() -> int:
+        return await track('queued')
+
+    @jsonrpc.request(max_concurrency_=2)
+    async def unbounded() -> int:
+        return await track('unbounded')
+
+    return app_
+
+
+@fixture
+def test_cli(loop, app, sanic_client):
+    return loop.run_until_complete(sanic_client(app))
+
+
+@mark.parametrize('in_,out', [(
+    [
+        {'jsonrpc': '2.0', 'method': 'queued', 'id': 1},
+        {'jsonrpc': '2.0', 'method': 'queued', 'id': 2},
+        {'jsonrpc': '2.0', 'method': 'queued', 'id': 3},
+        {'jsonrpc': '2.0', 'method': 'queued'},
+    ],
+    [
+        {'jsonrpc': '2.0', 'error': {'code': -32099, 'message': "Too busy"}, 'id': 3},
+        {'jsonrpc': '2.0', 'result': 1, 'id': 1},
+        {'jsonrpc': '2.0', 'result': 1, 'id': 2},
+    ]
+), (
+    [
+        {'jsonrpc': '2.0', 'method': 'unbounded', 'id': 1},
+        {'jsonrpc': '2.0', 'method': 'unbounded', 'id': 2},
+        {'jsonrpc': '2.0', 'method': 'unbounded', 'id': 3},
+        {'jsonrpc': '2.0', 'method': 'unbounded', 'id': 4},
+        {'jsonrpc': '2.0', 'method': 'unbounded', 'id': 5},
+    ],
+    [
+        {'jsonrpc': '2.0', 'result': 2, 'id': 1},
+        {'jsonrpc': '2.0', 'result': 2, 'id': 2},
+        {'jsonrpc': '2.0', 'result': 2, 'id': 3},
+        {'jsonrpc': '2.0', 'result': 2, 'id': 4},
+        {'jsonrpc': '2.0', 'result': 2, 'id': 5},
+    ]
+)])
+async def test_post(caplog, test_cli, in_: list, out: list):
+    caplog.set_level(DEBUG)
+
+    for _ in range(2):
+        response = await test_cli.post('/post', json=in_)
+        assert (response.status_code if hasattr(response, 'status_code') else response.status) == HTTPStatus.MULTI_STATUS
+
+        data = response.json()
+        data = (await data) if iscoroutine(data) else data
+
+        assert data == out
@@ -0,0 +1,122 @@
+from asyncio import CancelledError, iscoroutine, sleep
+from logging import DEBUG, ERROR
+from typing import List
+
+from httpx import Timeout
+from pytest import fixture, mark
+from sanic import Sanic
+from sanic.websocket import WebSocketProtocol
+from ujson import dumps
+
+from sanic_jsonrpc import Predicates, Request, Response, SanicJsonrpc
+
+Sanic.test_mode = True
+
+
+@fixture(params=[True, False])
+def cancel_on_disconnect(request):
+    return request.param
+
+
+@fixture
+def app(cancel_on_disconnect):
+    app_ = Sanic('sanic-jsonrpc')
+    jsonrpc = SanicJsonrpc(app_, '/post', '/ws', cancel_on_disconnect=cancel_on_disconnect)
+    events = []
+
+    async def work(name: str):
+        try:
+            await sleep(0.1)
+        except CancelledError:
+            events.append('cancelled ' + name)
+            raise
+
+        events.append('finished ' + name)
+
+    @jsonrpc
+    async def abandoned(name: str):
+        await work(name)
+
+    @jsonrpc
+    async def guarded(name: str):
+        try:
+            await work(name)
+        except Exception:
+            events.append('failed ' + name)
+            raise
+
+    @jsonrpc.middleware(Predicates.response)
+    def record(req: Request, res: Response):
+        if res.error:
+            events.append('error {} {}'.format(req.params[0], res.error.code))
+
+    @jsonrpc(cancel_on_disconnect_=False)
+    async def detached(name: str):
+        await work(name)
+
+    @jsonrpc
+    async def history() -> List[str]:
+        return sorted(events)
+
+    return app_
+
+
+@fixture
+def test_cli(loop, app, sanic_client):
+    return loop.run_until_complete(sanic_client(app))
+
+
+@fixture
+def test_cli_ws(loop, app, sanic_client):
+    return loop.run_until_complete(sanic_client(app, scheme='ws', protocol=WebSocketProtocol))
+
+
+async def history(test_cli) -> List[str]:
+    await sleep(0.2)
+    response = await test_cli.post('/post', json={'jsonrpc': '2.0', 'method': 'history', 'id': 0})
+    data = response.json()
+    data = (await data) if iscoroutine(data) else data
+    return data['result']
+
+
+@mark.parametrize('method', ['abandoned', 'detached'])
+async def test_ws(caplog, cancel_on_disconnect, test_cli_ws, method: str):
+    caplog.set_level(DEBUG)
+    ws = await test_cli_ws.ws_connect('/ws')
+    message = {'jsonrpc': '2.0', 'method': method, 'params': ['ws'], 'id': 1}
+    await ws.send(dumps(message)) if hasattr(ws, 'send') else await ws.send_json(message)
+    await sleep(0.02)
+    await ws.close()
+
+    cancelled = cancel_on_disconnect and method == 'abandoned'
+    assert await history(test_cli_ws) == ['cancelled ws' if cancelled else 'finished ws']
+    await test_cli_ws.close()
+
+
+@mark.parametrize('method', ['abandoned', 'detached'])
+async def test_post(caplog, cancel_on_disconnect, test_cli, method: str):
+    caplog.set_level(DEBUG)
+    message = [{'jsonrpc': '2.0', 'method': method, 'params': ['post'], 'id': 1}]
+
+    try:
+        await test_cli.post('/post', json=message, timeout=Timeout(1, read=0.02))
+    except Exception:
+        pass
+
+    cancelled = cancel_on_disconnect and method == 'abandoned'
+    assert await history(test_cli) == ['cancelled post' if cancelled else 'finished post']
+
+
+async def test_guarded(caplog, cancel_on_disconnect, test_cli_ws):
+    caplog.set_level(DEBUG)
+    ws = await test_cli_ws.ws_connect('/ws')
+    message = {'jsonrpc': '2.0', 'method': 'guarded', 'params': ['ws'], 'id': 1}
+    await ws.send(dumps(message)) if hasattr(ws, 'send') else await ws.send_json(message)
+    await sleep(0.02)
+    await ws.close()
+
+    events = await history(test_cli_ws)
+    assert ('cancelled ws' if cancel_on_disconnect else 'finished ws') in events
+    assert not [e for e in events if e.startswith('error')]
+    assert not [r for r in caplog.records if r.levelno >= ERROR]
+    await test_cli_ws.close()
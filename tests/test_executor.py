@@ -0,0 +1,127 @@
+from asyncio import CancelledError, ensure_future, iscoroutine, sleep as async_sleep
+from functools import partial
+from logging import DEBUG
+from operator import contains
+from threading import Event, current_thread
+from time import sleep
+from typing import List
+
+from pytest import fixture, mark, raises
+from sanic import Sanic
+
+from sanic_jsonrpc import Error, SanicJsonrpc, ThreadExecutor
+
+Sanic.test_mode = True
+
+
+def lists_equal_unordered(self: list, other: list) -> bool:
+    return all(map(partial(contains, other), self)) and all(map(partial(contains, self), other))
+
+
+@fixture
+def app():
+    app_ = Sanic('sanic-jsonrpc')
+    jsonrpc = SanicJsonrpc(app_, '/post', '/ws', executor=ThreadExecutor(2))
+    narrow = ThreadExecutor(1, 0, busy_error=Error(-32098, "No threads"))
+    threads = []
+
+    @jsonrpc.middleware('request')
+    def record():
+        threads.append(current_thread().name.startswith('sanic-jsonrpc'))
+
+    @jsonrpc
+    def pooled() -> bool:
+        return current_thread().name.startswith('sanic-jsonrpc')
+
+    @jsonrpc
+    async def native() -> bool:
+        return current_thread().name.startswith('sanic-jsonrpc')
+
+    @jsonrpc(executor_=None)
+    def inline() -> bool:
+        return current_thread().name.startswith('sanic-jsonrpc')
+
+    @jsonrpc(executor_=narrow)
+    def blocking(value: int) -> List[int]:
+        sleep(0.05)
+        return [value, narrow.running, narrow.queued]
+
+    @jsonrpc
+    async def stats() -> List[int]:
+        return [narrow.max_workers, narrow.max_queue, narrow.rejected, *threads]
+
+    return app_
+
+
+@fixture
+def test_cli(loop, app, sanic_client):
+    return loop.run_until_complete(sanic_client(app))
+
+
+@mark.parametrize('in_,out,rejected', [(
+    [
+        {'jsonrpc': '2.0', 'method': 'pooled', 'id': 1},
+        {'jsonrpc': '2.0', 'method': 'native', 'id': 2},
+        {'jsonrpc': '2.0', 'method': 'inline', 'id': 3},
+    ],
+    [
+        {'jsonrpc': '2.0', 'result': True, 'id': 1},
+        {'jsonrpc': '2.0', 'result': False, 'id': 2},
+        {'jsonrpc': '2.0', 'result': False, 'id': 3},
+    ],
+    0
+), (
+    [
+        {'jsonrpc': '2.0', 'method': 'blocking', 'params': [1], 'id': 1},
+        {'jsonrpc': '2.0', 'method': 'blocking', 'params': [2], 'id': 2},
+    ],
+    [
+        {'jsonrpc': '2.0', 'result': [1, 1, 0], 'id': 1},
+        {'jsonrpc': '2.0', 'error': {'code': -32098, 'message': "No threads"}, 'id': 2},
+    ],
+    1
+)])
+async def test_post(caplog, test_cli, in_: List[dict], out: List[dict], rejected: int):
+    caplog.set_level(DEBUG)
+    response = await test_cli.post('/post', json=in_)
+    data = response.json()
+    data = (await data) if iscoroutine(data) else data
+
+    assert lists_equal_unordered(data, out)
+
+    response = await test_cli.post('/post', json={'jsonrpc': '2.0', 'method': 'stats', 'id': 0})
+    data = response.json()
+    data = (await data) if iscoroutine(data) else data
+
+    assert data == {'jsonrpc': '2.0', 'result': [1, 0, rejected, *[True] * (len(in_) + 1)], 'id': 0}
+
+
+async def test_cancel():
+    executor = ThreadExecutor(1, 0)
+    unblock = Event()
+
+    task = ensure_future(executor.run(unblock.wait, 1))
+    await async_sleep(0.01)
+    task.cancel()
+
+    with raises(CancelledError):
+        await task
+
+    for _ in range(2):
+        assert executor.running == 1
+
+        with raises(Error) as exc_info:
+            await executor.run(int)
+
+        assert exc_info.value == executor.busy_error
+        assert exc_info.value is not executor.busy_error
+
+    unblock.set()
+
+    while executor.running:
+        await async_sleep(0.01)
+
+    assert await executor.run(int, '7') == 7
+    assert (executor.running, executor.queued, executor.rejected) == (0, 0, 2)
+    assert executor.busy_error.__traceback__ is None
+    executor.shutdown()
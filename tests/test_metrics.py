@@ -0,0 +1,112 @@
+from asyncio import iscoroutine, sleep
+from http import HTTPStatus
+from logging import DEBUG
+
+from pytest import fixture
+from sanic import Sanic
+from sanic.websocket import WebSocketProtocol
+from ujson import dumps, loads
+
+from sanic_jsonrpc import Error, Metrics, SanicJsonrpc, Transports
+
+Sanic.test_mode = True
+
+
+@fixture
+def metrics():
+    return Metrics((0.01, 1))
+
+
+@fixture
+def app(metrics: Metrics):
+    app_ = Sanic('sanic-jsonrpc')
+    jsonrpc = SanicJsonrpc(app_, '/post', '/ws', metrics=metrics, metrics_route='/metrics')
+
+    @jsonrpc
+    def add(a: int, b: int) -> int:
+        return a + b
+
+    @jsonrpc
+    def fail():
+        raise Error(-1, "Failed")
+
+    @jsonrpc(max_concurrency_=1, max_queue_=0)
+    async def slow():
+        await sleep(0.02)
+
+    return app_
+
+
+@fixture
+def test_cli(loop, app, sanic_client):
+    return loop.run_until_complete(sanic_client(app))
+
+
+@fixture
+def test_cli_ws(loop, app, sanic_client):
+    return loop.run_until_complete(sanic_client(app, scheme='ws', protocol=WebSocketProtocol))
+
+
+async def test_post(caplog, test_cli):
+    caplog.set_level(DEBUG)
+    await test_cli.post('/post', json=[
+        {'jsonrpc': '2.0', 'method': 'add', 'params': [1, 2], 'id': 1},
+        {'jsonrpc': '2.0', 'method': 'add', 'params': [1, 'x'], 'id': 2},
+        {'jsonrpc': '2.0', 'method': 'fail', 'id': 3},
+        {'jsonrpc': '2.0', 'method': 'slow', 'id': 4},
+        {'jsonrpc': '2.0', 'method': 'slow', 'id': 5},
+    ])
+    response = await test_cli.get('/metrics')
+    text = response.text
+    text = (await text) if iscoroutine(text) else text
+    lines = text.splitlines()
+
+    assert (response.status_code if hasattr(response, 'status_code') else response.status) == HTTPStatus.OK
+    assert response.headers['content-type'].startswith('text/plain')
+    assert '# TYPE sanic_jsonrpc_calls_total counter' in lines
+    assert '# TYPE sanic_jsonrpc_duration_seconds histogram' in lines
+    assert 'sanic_jsonrpc_calls_total{transport="post",method="add"} 2' in lines
+    assert 'sanic_jsonrpc_errors_total{transport="post",method="add",code="-32602"} 1' in lines
+    assert 'sanic_jsonrpc_errors_total{transport="post",method="fail",code="-1"} 1' in lines
+    assert 'sanic_jsonrpc_calls_total{transport="post",method="slow"} 2' in lines
+    assert 'sanic_jsonrpc_errors_total{transport="post",method="slow",code="-32000"} 1' in lines
+    assert 'sanic_jsonrpc_in_flight{transport="post",method="add"} 0' in lines
+    assert 'sanic_jsonrpc_duration_seconds_bucket{transport="post",method="add",le="0.01"} 2' in lines
+    assert 'sanic_jsonrpc_duration_seconds_bucket{transport="post",method="slow",le="0.01"} 0' in lines
+    assert 'sanic_jsonrpc_duration_seconds_bucket{transport="post",method="slow",le="+Inf"} 1' in lines
+    assert 'sanic_jsonrpc_duration_seconds_count{transport="post",method="slow"} 1' in lines
+    assert not any(line.startswith('sanic_jsonrpc_calls_total{transport="ws"') for line in lines)
+
+
+async def test_ws(caplog, test_cli_ws, metrics: Metrics):
+    caplog.set_level(DEBUG)
+    ws = await test_cli_ws.ws_connect('/ws')
+    await ws.send(dumps({'jsonrpc': '2.0', 'method': 'add', 'params': [1, 2], 'id': 1}))
+
+    assert loads(await ws.recv()) == {'jsonrpc': '2.0', 'result': 3, 'id': 1}
+
+    assert metrics.series(Transports.ws, 'add').calls == 1
+    assert metrics.series(Transports.ws, 'add').count == 1
+    assert metrics.series(Transports.post, 'add').calls == 0
+
+    await ws.close()
+    await test_cli_ws.close()
+
+
+def test_buckets():
+    metrics = Metrics((1, 0.1))
+    series = metrics.series(Transports.post, 'x"y')
+
+    series.enter()
+    assert series.in_flight == 1
+    series.exit(0.1)
+    series.enter()
+    series.exit(0.5, -1)
+    series.enter()
+    series.exit(5.0)
+
+    assert metrics.buckets == (0.1, 1)
+    assert series.counts == [1, 1, 1]
+    assert series.errors == {-1: 1}
+    assert series.in_flight == 0
+    assert 'sanic_jsonrpc_duration_seconds_bucket{transport="post",method="x\\"y",le="1"} 2' in metrics.render()
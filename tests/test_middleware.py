@@ -1,4 +1,4 @@
-from asyncio import TimeoutError, iscoroutine, wait_for
+from asyncio import TimeoutError, iscoroutine, sleep, wait_for
 from functools import partial
 from logging import DEBUG
 from operator import contains
@@ -136,6 +136,21 @@ def app():
         if notifier:
             notifier.send(Notification('outgoing_middleware_callback'))
 
+    @jsonrpc.middleware(Predicates.request)
+    async def async_middleware_first_middleware(request: Request):
+        if request.method == 'async_middleware':
+            await sleep(0.01)
+            request.params.append('async_middleware_first_middleware')
+
+    @jsonrpc.middleware(Predicates.request)
+    def async_middleware_second_middleware(request: Request):
+        if request.method == 'async_middleware':
+            request.params.append('async_middleware_second_middleware')
+
+    @jsonrpc
+    def async_middleware(*params: str) -> List[str]:
+        return [*params, 'async_middleware']
+
     return app_
 
 
@@ -179,6 +194,11 @@ def test_cli_ws(loop, app, sanic_client):
 ), (
     {'jsonrpc': '2.0', 'method': 'outgoing_middleware', 'id': 8},
     {'jsonrpc': '2.0', 'result': 'outgoing_middleware_middleware', 'id': 8}
+), (
+    {'jsonrpc': '2.0', 'method': 'async_middleware', 'params': [], 'id': 9},
+    {'jsonrpc': '2.0', 'result': [
+        'async_middleware_first_middleware', 'async_middleware_second_middleware', 'async_middleware'
+    ], 'id': 9}
 )])
 async def test_post(caplog, test_cli, in_: dict, out: dict):
     caplog.set_level(DEBUG)
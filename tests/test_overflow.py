@@ -0,0 +1,176 @@
+from asyncio import TimeoutError, wait_for
+from functools import partial
+from logging import DEBUG
+from operator import contains
+from typing import List, Optional
+
+from pytest import fixture, mark, raises
+from sanic import Sanic
+from sanic.websocket import WebSocketProtocol
+from ujson import dumps, loads
+from websockets import ConnectionClosed
+
+from sanic_jsonrpc import Notification, Notifier, Overflow, SanicJsonrpc
+
+Sanic.test_mode = True
+
+
+def lists_equal_unordered(self: list, other: list) -> bool:
+    return all(map(partial(contains, other), self)) and all(map(partial(contains, self), other))
+
+
+@fixture
+def overflow():
+    return Overflow.drop_oldest
+
+
+@fixture
+def queue_size():
+    return 2
+
+
+@fixture
+def app(overflow: Overflow, queue_size: Optional[int]):
+    app_ = Sanic('sanic-jsonrpc')
+    jsonrpc = SanicJsonrpc(app_, '/post', '/ws', ws_queue_size=queue_size, ws_overflow=overflow)
+
+    @jsonrpc
+    def flood(notifier: Notifier, methods: List[str]) -> List[int]:
+        for i, method in enumerate(methods):
+            notifier.send(Notification(method, [i]))
+
+        return [notifier.queued, notifier.dropped]
+
+    @jsonrpc
+    def ticks(notifier: Notifier, symbols: List[str]) -> List[int]:
+        for i, symbol in enumerate(symbols):
+            notifier.send(Notification('tick', [symbol, i]), conflate=('tick', symbol))
+
+        return [notifier.queued, notifier.dropped, notifier.conflated]
+
+    @jsonrpc
+    async def wait(notifier: Notifier) -> List[bool]:
+        return [await notifier.send(Notification('wait', None)), notifier.queued]
+
+    return app_
+
+
+@fixture
+def test_cli_ws(loop, app, sanic_client):
+    return loop.run_until_complete(sanic_client(app, scheme='ws', protocol=WebSocketProtocol))
+
+
+async def call(ws, method: str, *params) -> List[dict]:
+    await ws.send(dumps({'jsonrpc': '2.0', 'method': method, 'params': list(params), 'id': 1}))
+    messages = []
+
+    while True:
+        try:
+            messages.append(loads(await wait_for(ws.recv(), 0.05)))
+        except TimeoutError:
+            break
+
+    return messages
+
+
+@mark.parametrize('overflow,out', [(
+    Overflow.drop_oldest, [
+        {'jsonrpc': '2.0', 'result': [2, 3], 'id': 1},
+        {'jsonrpc': '2.0', 'method': 'b', 'params': [3]},
+        {'jsonrpc': '2.0', 'method': 'c', 'params': [4]},
+    ]
+), (
+    Overflow.drop_newest, [
+        {'jsonrpc': '2.0', 'result': [2, 3], 'id': 1},
+        {'jsonrpc': '2.0', 'method': 'a', 'params': [0]},
+        {'jsonrpc': '2.0', 'method': 'b', 'params': [1]},
+    ]
+), (
+    Overflow.conflate, [
+        {'jsonrpc': '2.0', 'result': [2, 3], 'id': 1},
+        {'jsonrpc': '2.0', 'method': 'b', 'params': [3]},
+        {'jsonrpc': '2.0', 'method': 'c', 'params': [4]},
+    ]
+), (
+    'conflate', [
+        {'jsonrpc': '2.0', 'result': [2, 3], 'id': 1},
+        {'jsonrpc': '2.0', 'method': 'b', 'params': [3]},
+        {'jsonrpc': '2.0', 'method': 'c', 'params': [4]},
+    ]
+)])
+async def test_overflow(caplog, test_cli_ws, out: List[dict]):
+    caplog.set_level(DEBUG)
+    ws = await test_cli_ws.ws_connect('/ws')
+
+    assert lists_equal_unordered(await call(ws, 'flood', ['a', 'b', 'a', 'b', 'c']), out)
+
+    await ws.close()
+    await test_cli_ws.close()
+
+
+@mark.parametrize('overflow', [Overflow.conflate])
+async def test_conflate(caplog, test_cli_ws):
+    caplog.set_level(DEBUG)
+    ws = await test_cli_ws.ws_connect('/ws')
+
+    assert lists_equal_unordered(await call(ws, 'flood', ['a', 'b', 'a', 'a']), [
+        {'jsonrpc': '2.0', 'result': [2, 2], 'id': 1},
+        {'jsonrpc': '2.0', 'method': 'b', 'params': [1]},
+        {'jsonrpc': '2.0', 'method': 'a', 'params': [3]},
+    ])
+
+    await ws.close()
+    await test_cli_ws.close()
+
+
+@mark.parametrize('overflow', [Overflow.disconnect])
+async def test_disconnect(caplog, test_cli_ws):
+    caplog.set_level(DEBUG)
+    ws = await test_cli_ws.ws_connect('/ws')
+    await ws.send(dumps({'jsonrpc': '2.0', 'method': 'flood', 'params': [['a', 'b', 'c']], 'id': 1}))
+
+    with raises(ConnectionClosed):
+        while True:
+            await wait_for(ws.recv(), 1)
+
+    assert ws.close_code == 1008
+
+    await test_cli_ws.close()
+
+
+@mark.parametrize('queue_size', [2, None])
+async def test_conflate_key(caplog, test_cli_ws):
+    caplog.set_level(DEBUG)
+    ws = await test_cli_ws.ws_connect('/ws')
+
+    messages = await call(ws, 'ticks', ['x', 'y', 'x', 'y', 'x'])
+    assert {'jsonrpc': '2.0', 'result': [2, 0, 3], 'id': 1} in messages
+    assert [m for m in messages if 'method' in m] == [
+        {'jsonrpc': '2.0', 'method': 'tick', 'params': ['x', 4]},
+        {'jsonrpc': '2.0', 'method': 'tick', 'params': ['y', 3]},
+    ]
+    assert lists_equal_unordered(await call(ws, 'ticks', ['x']), [
+        {'jsonrpc': '2.0', 'result': [1, 0, 3], 'id': 1},
+        {'jsonrpc': '2.0', 'method': 'tick', 'params': ['x', 0]},
+    ])
+
+    await ws.close()
+    await test_cli_ws.close()
+
+
+async def test_wait(caplog, test_cli_ws):
+    caplog.set_level(DEBUG)
+    ws = await test_cli_ws.ws_connect('/ws')
+
+    assert lists_equal_unordered(await call(ws, 'wait'), [
+        {'jsonrpc': '2.0', 'result': [True, 0], 'id': 1},
+        {'jsonrpc': '2.0', 'method': 'wait', 'params': None},
+    ])
+
+    await ws.close()
+    await test_cli_ws.close()
+
+
+def test_invalid_queue_size():
+    with raises(ValueError):
+        SanicJsonrpc(Sanic('sanic-jsonrpc'), ws_queue_size=0)
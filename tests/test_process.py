@@ -0,0 +1,119 @@
+from asyncio import iscoroutine
+from functools import partial
+from hashlib import sha256
+from logging import DEBUG
+from operator import contains
+from os import getpid
+from typing import List
+
+from pytest import fixture, mark, raises
+from sanic import Sanic
+from sanic.request import Request as SanicRequest
+
+from sanic_jsonrpc import Error, SanicJsonrpc
+
+Sanic.test_mode = True
+
+PID = getpid()
+
+
+def lists_equal_unordered(self: list, other: list) -> bool:
+    return all(map(partial(contains, other), self)) and all(map(partial(contains, self), other))
+
+
+def digest(data: str, rounds: int = 1) -> str:
+    value = data.encode()
+
+    for _ in range(rounds):
+        value = sha256(value).digest()
+
+    return value.hex()
+
+
+def remote() -> bool:
+    return getpid() != PID
+
+
+def fail():
+    raise Error(-1, "Failed", [1])
+
+
+def broken() -> int:
+    return 'not an int'
+
+
+def needs_request(req: SanicRequest) -> List[int]:
+    return []
+
+
+async def coroutine() -> int:
+    return 0
+
+
+@fixture
+def app():
+    app_ = Sanic('sanic-jsonrpc')
+    jsonrpc = SanicJsonrpc(app_, '/post', '/ws', process_workers=2)
+
+    jsonrpc(cpu_bound_=True)(digest)
+    jsonrpc(cpu_bound_=True)(remote)
+    jsonrpc(cpu_bound_=True)(fail)
+    jsonrpc(cpu_bound_=True)(broken)
+
+    return app_
+
+
+@fixture
+def test_cli(loop, app, sanic_client):
+    return loop.run_until_complete(sanic_client(app))
+
+
+@mark.parametrize('in_,out', [(
+    {'jsonrpc': '2.0', 'method': 'digest', 'params': ['abc'], 'id': 1},
+    {'jsonrpc': '2.0', 'result': digest('abc'), 'id': 1}
+), (
+    {'jsonrpc': '2.0', 'method': 'digest', 'params': {'data': 'abc', 'rounds': 3}, 'id': 2},
+    {'jsonrpc': '2.0', 'result': digest('abc', 3), 'id': 2}
+), (
+    {'jsonrpc': '2.0', 'method': 'digest', 'params': [1, 'x'], 'id': 3},
+    {'jsonrpc': '2.0', 'error': {'code': -32602, 'message': "Invalid params"}, 'id': 3}
+), (
+    {'jsonrpc': '2.0', 'method': 'remote', 'id': 4},
+    {'jsonrpc': '2.0', 'result': True, 'id': 4}
+), (
+    {'jsonrpc': '2.0', 'method': 'fail', 'id': 5},
+    {'jsonrpc': '2.0', 'error': {'code': -1, 'message': "Failed", 'data': [1]}, 'id': 5}
+), (
+    {'jsonrpc': '2.0', 'method': 'broken', 'id': 6},
+    {'jsonrpc': '2.0', 'error': {'code': -32603, 'message': "Internal error"}, 'id': 6}
+), (
+    [
+        {'jsonrpc': '2.0', 'method': 'digest', 'params': ['a'], 'id': 7},
+        {'jsonrpc': '2.0', 'method': 'digest', 'params': ['b'], 'id': 8},
+    ],
+    [
+        {'jsonrpc': '2.0', 'result': digest('a'), 'id': 7},
+        {'jsonrpc': '2.0', 'result': digest('b'), 'id': 8},
+    ]
+)])
+async def test_post(caplog, test_cli, in_, out):
+    caplog.set_level(DEBUG)
+    response = await test_cli.post('/post', json=in_)
+    data = response.json()
+    data = (await data) if iscoroutine(data) else data
+
+    if isinstance(out, list):
+        assert lists_equal_unordered(data, out)
+    else:
+        assert data == out
+
+
+def test_invalid_routes():
+    jsonrpc = SanicJsonrpc(Sanic('sanic-jsonrpc-invalid'))
+
+    def local() -> int:
+        return 0
+
+    for func in (local, needs_request, coroutine):
+        with raises(ValueError):
+            jsonrpc(cpu_bound_=True)(func)
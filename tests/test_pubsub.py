@@ -0,0 +1,199 @@
+from asyncio import TimeoutError, iscoroutine, wait_for
+from functools import partial
+from logging import DEBUG
+from operator import contains
+from typing import Any, List, Optional
+
+from pytest import fixture, raises
+from sanic import Sanic
+from sanic.websocket import WebSocketProtocol
+from ujson import dumps, loads
+from websockets import ConnectionClosed
+
+from sanic_jsonrpc import Codec, Notification, Notifier, SanicJsonrpc
+
+Sanic.test_mode = True
+
+
+def lists_equal_unordered(self: list, other: list) -> bool:
+    return all(map(partial(contains, other), self)) and all(map(partial(contains, self), other))
+
+
+@fixture
+def encoded():
+    return []
+
+
+@fixture
+def app(encoded):
+    def counting_dumps(obj: Any) -> str:
+        if isinstance(obj, Notification):
+            encoded.append(obj.method)
+
+        return dumps(obj)
+
+    def strict_loads(data: str) -> Any:
+        if data == 'explode':
+            raise RuntimeError("Unexpected frame")
+
+        return loads(data)
+
+    app_ = Sanic('sanic-jsonrpc')
+    jsonrpc = SanicJsonrpc(app_, '/post', '/ws', codec=Codec(counting_dumps, strict_loads))
+    tracked = []
+
+    @jsonrpc.ws
+    def subscribe_tracked(notifier: Notifier, topic: str) -> bool:
+        tracked.append(notifier)
+        return jsonrpc.subscribe(notifier, topic)
+
+    @jsonrpc.post
+    def leaked() -> int:
+        return sum(len(jsonrpc.subscriptions(n)) for n in tracked)
+
+    @jsonrpc.ws
+    def subscribe(notifier: Notifier, topic: str) -> bool:
+        return jsonrpc.subscribe(notifier, topic)
+
+    @jsonrpc.ws
+    def unsubscribe(notifier: Notifier, topic: Optional[str] = None) -> bool:
+        return jsonrpc.unsubscribe(notifier, topic)
+
+    @jsonrpc.ws
+    def subscriptions(notifier: Notifier) -> List[str]:
+        return sorted(jsonrpc.subscriptions(notifier))
+
+    @jsonrpc
+    def publish(topic: str, value: int) -> int:
+        return jsonrpc.publish(topic, Notification(topic, [value]))
+
+    return app_
+
+
+@fixture
+def test_cli(loop, app, sanic_client):
+    return loop.run_until_complete(sanic_client(app))
+
+
+@fixture
+def test_cli_ws(loop, app, sanic_client):
+    return loop.run_until_complete(sanic_client(app, scheme='ws', protocol=WebSocketProtocol))
+
+
+async def call(ws, method: str, *params: Any) -> List[dict]:
+    data = {'jsonrpc': '2.0', 'method': method, 'params': list(params), 'id': 0}
+    await ws.send(dumps(data)) if hasattr(ws, 'send') else await ws.send_json(data)
+    messages = []
+
+    while True:
+        try:
+            message = await wait_for(ws.recv(), 0.05) if hasattr(ws, 'recv') else await ws.receive_str(timeout=0.05)
+        except TimeoutError:
+            break
+
+        messages.append(loads(message))
+
+    return messages
+
+
+async def test_ws(caplog, test_cli_ws, encoded: List[str]):
+    caplog.set_level(DEBUG)
+    first = await test_cli_ws.ws_connect('/ws')
+    second = await test_cli_ws.ws_connect('/ws')
+
+    assert await call(first, 'subscribe', 'news') == [{'jsonrpc': '2.0', 'result': True, 'id': 0}]
+    assert await call(first, 'subscribe', 'news') == [{'jsonrpc': '2.0', 'result': False, 'id': 0}]
+    assert await call(first, 'subscribe', 'sport') == [{'jsonrpc': '2.0', 'result': True, 'id': 0}]
+    assert await call(second, 'subscribe', 'news') == [{'jsonrpc': '2.0', 'result': True, 'id': 0}]
+    assert await call(first, 'subscriptions') == [{'jsonrpc': '2.0', 'result': ['news', 'sport'], 'id': 0}]
+
+    assert lists_equal_unordered(await call(first, 'publish', 'news', 1), [
+        {'jsonrpc': '2.0', 'result': 2, 'id': 0},
+        {'jsonrpc': '2.0', 'method': 'news', 'params': [1]},
+    ])
+    assert lists_equal_unordered(await call(second, 'subscriptions'), [
+        {'jsonrpc': '2.0', 'method': 'news', 'params': [1]},
+        {'jsonrpc': '2.0', 'result': ['news'], 'id': 0},
+    ])
+    assert encoded == ['news']
+
+    assert await call(first, 'unsubscribe', 'news') == [{'jsonrpc': '2.0', 'result': True, 'id': 0}]
+    await second.close()
+    assert await call(first, 'publish', 'news', 2) == [{'jsonrpc': '2.0', 'result': 0, 'id': 0}]
+    assert await call(first, 'unsubscribe') == [{'jsonrpc': '2.0', 'result': True, 'id': 0}]
+    assert await call(first, 'subscriptions') == [{'jsonrpc': '2.0', 'result': [], 'id': 0}]
+
+    await first.close()
+    await test_cli_ws.close()
+
+
+async def test_post(caplog, test_cli):
+    caplog.set_level(DEBUG)
+    response = await test_cli.post('/post', json={'jsonrpc': '2.0', 'method': 'publish', 'params': ['x', 1], 'id': 1})
+    data = response.json()
+    data = (await data) if iscoroutine(data) else data
+
+    assert data == {'jsonrpc': '2.0', 'result': 0, 'id': 1}
+
+
+async def test_cleanup(caplog, test_cli_ws):
+    caplog.set_level(DEBUG)
+    ws = await test_cli_ws.ws_connect('/ws')
+
+    assert await call(ws, 'subscribe_tracked', 'news') == [{'jsonrpc': '2.0', 'result': True, 'id': 0}]
+    await ws.send('explode')
+
+    with raises(ConnectionClosed):
+        await wait_for(ws.recv(), 1)
+
+    response = await test_cli_ws.post('/post', json={'jsonrpc': '2.0', 'method': 'leaked', 'id': 1})
+    data = response.json()
+    data = (await data) if iscoroutine(data) else data
+
+    assert data == {'jsonrpc': '2.0', 'result': 0, 'id': 1}
+    await test_cli_ws.close()
+
+
+async def test_bus(caplog, sanic_client, tmp_path):
+    caplog.set_level(DEBUG)
+
+    def worker(name: str) -> Sanic:
+        app_ = Sanic(name)
+        jsonrpc = SanicJsonrpc(app_, '/post', '/ws', ipc_path=str(tmp_path))
+
+        @jsonrpc.ws
+        def subscribe(notifier: Notifier, topic: str) -> bool:
+            return jsonrpc.subscribe(notifier, topic)
+
+        @jsonrpc
+        def publish(topic: str, value: int, padding: int = 0) -> int:
+            return jsonrpc.publish(topic, Notification(topic, [value, 'x' * padding] if padding else [value]))
+
+        return app_
+
+    publisher = await sanic_client(worker('sanic-jsonrpc-publisher'), scheme='ws', protocol=WebSocketProtocol)
+    listener = await sanic_client(worker('sanic-jsonrpc-listener'), scheme='ws', protocol=WebSocketProtocol)
+    local = await publisher.ws_connect('/ws')
+    remote = await listener.ws_connect('/ws')
+
+    assert await call(local, 'subscribe', 'news') == [{'jsonrpc': '2.0', 'result': True, 'id': 0}]
+    assert await call(remote, 'subscribe', 'news') == [{'jsonrpc': '2.0', 'result': True, 'id': 0}]
+    assert lists_equal_unordered(await call(local, 'publish', 'news', 1), [
+        {'jsonrpc': '2.0', 'result': 1, 'id': 0},
+        {'jsonrpc': '2.0', 'method': 'news', 'params': [1]},
+    ])
+    assert await call(remote, 'subscribe', 'news') == [
+        {'jsonrpc': '2.0', 'method': 'news', 'params': [1]},
+        {'jsonrpc': '2.0', 'result': False, 'id': 0},
+    ]
+    assert await call(local, 'publish', 'news', 2, 300000) == [
+        {'jsonrpc': '2.0', 'error': {'code': -32603, 'message': "Internal error"}, 'id': 0},
+    ]
+    assert await call(remote, 'subscribe', 'news') == [{'jsonrpc': '2.0', 'result': False, 'id': 0}]
+    assert "limit is" in caplog.text
+
+    await local.close()
+    await remote.close()
+    await publisher.close()
+    await listener.close()
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,157 @@
+from asyncio import iscoroutine, sleep
+from http import HTTPStatus
+from logging import DEBUG
+from typing import AsyncIterator, List
+
+from pytest import fixture, mark
+from sanic import Sanic
+
+from sanic_jsonrpc import SanicJsonrpc
+
+Sanic.test_mode = True
+
+
+@fixture
+def app():
+    app_ = Sanic('sanic-jsonrpc')
+    jsonrpc = SanicJsonrpc(app_, '/post', stream_batches=True)
+
+    @jsonrpc
+    async def slow(delay: float) -> float:
+        await sleep(delay)
+        return delay
+
+    @jsonrpc.notification
+    def notify():
+        pass
+
+    return app_
+
+
+@fixture
+def app_requests():
+    app_ = Sanic('sanic-jsonrpc')
+    jsonrpc = SanicJsonrpc(app_, '/post', stream_requests=True)
+
+    @jsonrpc
+    def echo(*params: str) -> List[str]:
+        return list(params)
+
+    @jsonrpc.notification
+    def notify():
+        pass
+
+    return app_
+
+
+@fixture
+def test_cli(loop, app, sanic_client):
+    return loop.run_until_complete(sanic_client(app))
+
+
+@fixture
+def test_cli_requests(loop, app_requests, sanic_client):
+    return loop.run_until_complete(sanic_client(app_requests))
+
+
+@mark.parametrize('in_,out', [(
+    '['
+    '    {"jsonrpc": "2.0", "method": "slow", "params": [0.03], "id": 1},'
+    '    {"jsonrpc": "2.0", "method": "slow", "params": [0.01], "id": 2},'
+    '    {"jsonrpc": "2.0", "method": "missing", "id": 3},'
+    '    {"jsonrpc": "2.0", "method": "notify"},'
+    '    1'
+    ']',
+    [
+        {'jsonrpc': '2.0', 'error': {'code': -32601, 'message': "Method not found"}, 'id': 3},
+        {'jsonrpc': '2.0', 'error': {'code': -32600, 'message': "Invalid Request"}, 'id': None},
+        {'jsonrpc': '2.0', 'result': 0.01, 'id': 2},
+        {'jsonrpc': '2.0', 'result': 0.03, 'id': 1},
+    ]
+), (
+    '[{"jsonrpc": "2.0", "method": "slow", "params": [0], "id": 4}]',
+    [{'jsonrpc': '2.0', 'result': 0, 'id': 4}]
+), (
+    '{"jsonrpc": "2.0", "method": "slow", "params": [0], "id": 5}',
+    {'jsonrpc': '2.0', 'result': 0, 'id': 5}
+), (
+    '[{"jsonrpc": "2.0", "method": "notify"}]',
+    None
+), (
+    '[1]',
+    [{'jsonrpc': '2.0', 'error': {'code': -32600, 'message': "Invalid Request"}, 'id': None}]
+)])
+async def test_post(caplog, test_cli, in_: str, out: list):
+    caplog.set_level(DEBUG)
+    try:
+        response = await test_cli.post('/post', content=in_)
+    except TypeError:
+        response = await test_cli.post('/post', data=in_)
+
+    if (response.status_code if hasattr(response, 'status_code') else response.status) == HTTPStatus.MULTI_STATUS:
+        data = response.json()
+        data = (await data) if iscoroutine(data) else data
+
+        assert data == out
+    else:
+        assert out is None
+
+
+async def chunks(data: str, size: int) -> AsyncIterator[bytes]:
+    data = data.encode()
+
+    for i in range(0, len(data), size):
+        yield data[i:i + size]
+
+
+@mark.parametrize('size', [1, 7, 1024])
+@mark.parametrize('in_,out', [(
+    '['
+    '    {"jsonrpc": "2.0", "method": "echo", "params": ["a,]", "b\\\\"], "id": 1},'
+    '    {"jsonrpc": "2.0", "method": "notify"},'
+    '    {"jsonrpc": "2.0", "method": "missing", "id": "2"},'
+    '    {"foo": "boo"},'
+    '    {"jsonrpc": "2.0", "method": "echo", "params": ["{\\"[]"], "id": 3}'
+    ']',
+    [
+        {'jsonrpc': '2.0', 'error': {'code': -32601, 'message': "Method not found"}, 'id': '2'},
+        {'jsonrpc': '2.0', 'error': {'code': -32600, 'message': "Invalid Request"}, 'id': None},
+        {'jsonrpc': '2.0', 'result': ['a,]', 'b\\'], 'id': 1},
+        {'jsonrpc': '2.0', 'result': ['{"[]'], 'id': 3},
+    ]
+), (
+    '{"jsonrpc": "2.0", "method": "echo", "params": ["single"], "id": 4}',
+    {'jsonrpc': '2.0', 'result': ['single'], 'id': 4}
+), (
+    '['
+    '    {"jsonrpc": "2.0", "method": "echo", "params": [], "id": 5},'
+    '    {"jsonrpc": "2.0", "method"'
+    ']',
+    {'jsonrpc': '2.0', 'error': {'code': -32700, 'message': "Parse error"}, 'id': None}
+), (
+    '[{"jsonrpc": "2.0", "method": "echo", "params": [], "id": 6}] trailing',
+    {'jsonrpc': '2.0', 'error': {'code': -32700, 'message': "Parse error"}, 'id': None}
+), (
+    '[{"jsonrpc": "2.0", "method": "echo", "params": [], "id": 7}',
+    {'jsonrpc': '2.0', 'error': {'code': -32700, 'message': "Parse error"}, 'id': None}
+), (
+    ' [ ] ',
+    {'jsonrpc': '2.0', 'error': {'code': -32600, 'message': "Invalid Request"}, 'id': None}
+), (
+    '[1, 2]',
+    [
+        {'jsonrpc': '2.0', 'error': {'code': -32600, 'message': "Invalid Request"}, 'id': None},
+        {'jsonrpc': '2.0', 'error': {'code': -32600, 'message': "Invalid Request"}, 'id': None},
+    ]
+), (
+    '[{"jsonrpc": "2.0", "method": "notify"}]',
+    None
+)])
+async def test_post_requests(caplog, test_cli_requests, in_: str, out: list, size: int):
+    caplog.set_level(DEBUG)
+    response = await test_cli_requests.post('/post', content=chunks(in_, size))
+
+    if response.status_code == HTTPStatus.MULTI_STATUS:
+        assert response.json() == out
+    else:
+        assert out is None
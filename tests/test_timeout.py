@@ -0,0 +1,174 @@
+from asyncio import CancelledError, TimeoutError, iscoroutine, sleep, wait_for
+from functools import partial
+from logging import DEBUG
+from operator import contains
+from time import time
+from typing import List, Optional
+
+from pytest import fixture, mark
+from sanic import Sanic
+from sanic.websocket import WebSocketProtocol
+from ujson import dumps, loads
+
+from sanic_jsonrpc import REQUEST_TIMEOUT, SanicJsonrpc
+
+Sanic.test_mode = True
+
+TIMEOUT = {'code': -32001, 'message': "Request timeout"}
+
+
+def lists_equal_unordered(self: list, other: list) -> bool:
+    return all(map(partial(contains, other), self)) and all(map(partial(contains, self), other))
+
+
+@fixture
+def app():
+    app_ = Sanic('sanic-jsonrpc')
+    jsonrpc = SanicJsonrpc(app_, '/post', '/ws', timeout=0.3)
+    events = []
+
+    @jsonrpc(timeout_=0.05)
+    async def slow(name: str) -> str:
+        events.append('started ' + name)
+
+        try:
+            await sleep(0.2)
+        except CancelledError:
+            events.append('cancelled ' + name)
+            raise
+
+        return name
+
+    @jsonrpc
+    async def default(delay: float) -> float:
+        await sleep(delay)
+        return delay
+
+    @jsonrpc(timeout_=None)
+    async def unbounded(delay: float) -> float:
+        await sleep(delay)
+        return delay
+
+    @jsonrpc
+    async def history() -> List[str]:
+        return events
+
+    return app_
+
+
+@fixture
+def test_cli(loop, app, sanic_client):
+    return loop.run_until_complete(sanic_client(app))
+
+
+@fixture
+def test_cli_ws(loop, app, sanic_client):
+    return loop.run_until_complete(sanic_client(app, scheme='ws', protocol=WebSocketProtocol))
+
+
+@mark.parametrize('in_,deadline,out,events', [(
+    [
+        {'jsonrpc': '2.0', 'method': 'slow', 'params': ['a'], 'id': 1},
+        {'jsonrpc': '2.0', 'method': 'default', 'params': [0.01], 'id': 2},
+        {'jsonrpc': '2.0', 'method': 'default', 'params': [0.5], 'id': 3},
+        {'jsonrpc': '2.0', 'method': 'unbounded', 'params': [0.4], 'id': 4},
+    ],
+    None,
+    [
+        {'jsonrpc': '2.0', 'error': TIMEOUT, 'id': 1},
+        {'jsonrpc': '2.0', 'result': 0.01, 'id': 2},
+        {'jsonrpc': '2.0', 'error': TIMEOUT, 'id': 3},
+        {'jsonrpc': '2.0', 'result': 0.4, 'id': 4},
+    ],
+    ['started a', 'cancelled a']
+), (
+    [
+        {'jsonrpc': '2.0', 'method': 'slow', 'params': ['b'], 'id': 1},
+        {'jsonrpc': '2.0', 'method': 'unbounded', 'params': [0.01], 'id': 2},
+    ],
+    -1,
+    [
+        {'jsonrpc': '2.0', 'error': TIMEOUT, 'id': 1},
+        {'jsonrpc': '2.0', 'error': TIMEOUT, 'id': 2},
+    ],
+    []
+), (
+    [
+        {'jsonrpc': '2.0', 'method': 'unbounded', 'params': [0.01], 'id': 1},
+        {'jsonrpc': '2.0', 'method': 'unbounded', 'params': [0.5], 'id': 2},
+    ],
+    0.1,
+    [
+        {'jsonrpc': '2.0', 'result': 0.01, 'id': 1},
+        {'jsonrpc': '2.0', 'error': TIMEOUT, 'id': 2},
+    ],
+    []
+), (
+    [
+        {'jsonrpc': '2.0', 'method': 'unbounded', 'params': [0.01], 'id': 1},
+    ],
+    'soon',
+    [
+        {'jsonrpc': '2.0', 'result': 0.01, 'id': 1},
+    ],
+    []
+)])
+async def test_post(caplog, test_cli, in_: List[dict], deadline, out: List[dict], events: List[str]):
+    caplog.set_level(DEBUG)
+    headers = {}
+
+    if deadline is not None:
+        headers['X-Jsonrpc-Deadline'] = str(time() + deadline) if isinstance(deadline, (int, float)) else deadline
+
+    response = await test_cli.post('/post', json=in_, headers=headers)
+    data = response.json()
+    data = (await data) if iscoroutine(data) else data
+
+    assert lists_equal_unordered(data, out)
+    assert REQUEST_TIMEOUT.__traceback__ is None
+
+    response = await test_cli.post('/post', json={'jsonrpc': '2.0', 'method': 'history', 'id': 0})
+    data = response.json()
+    data = (await data) if iscoroutine(data) else data
+
+    assert data['result'] == events
+
+
+@mark.parametrize('in_,out', [(
+    [
+        ({'jsonrpc': '2.0', 'method': 'unbounded', 'params': [0.01], 'id': 1}, -1),
+        ({'jsonrpc': '2.0', 'method': 'unbounded', 'params': [0.2], 'id': 2}, 0.05),
+        ({'jsonrpc': '2.0', 'method': 'unbounded', 'params': [0.01], 'id': 3}, 1),
+        ({'jsonrpc': '2.0', 'method': 'unbounded', 'params': [0.01], 'id': 4}, None),
+    ],
+    [
+        {'jsonrpc': '2.0', 'error': TIMEOUT, 'id': 1},
+        {'jsonrpc': '2.0', 'error': TIMEOUT, 'id': 2},
+        {'jsonrpc': '2.0', 'result': 0.01, 'id': 3},
+        {'jsonrpc': '2.0', 'result': 0.01, 'id': 4},
+    ]
+)])
+async def test_ws(caplog, test_cli_ws, in_: List[tuple], out: List[dict]):
+    caplog.set_level(DEBUG)
+    ws = await test_cli_ws.ws_connect('/ws')
+
+    for message, deadline in in_:  # type: dict, Optional[float]
+        if deadline is not None:
+            message = dict(message, deadline=time() + deadline)
+
+        await ws.send(dumps(message)) if hasattr(ws, 'send') else await ws.send_json(message)
+
+    left = []
+
+    while True:
+        try:
+            message = await wait_for(ws.recv(), 0.3) if hasattr(ws, 'recv') else await ws.receive_str(timeout=0.3)
+        except TimeoutError:
+            break
+
+        left.append(loads(message))
+
+    await ws.close()
+    await test_cli_ws.close()
+
+    assert lists_equal_unordered(left, out)
@@ -0,0 +1,113 @@
+from asyncio import iscoroutine, sleep
+from logging import DEBUG
+from typing import List, Tuple
+
+from pytest import fixture, mark
+from sanic import Sanic
+from sanic.websocket import WebSocketProtocol
+from ujson import dumps, loads
+
+from sanic_jsonrpc import Incoming, SanicJsonrpc, ThreadExecutor, Timings, Transports
+
+Sanic.test_mode = True
+
+_CALL = ['received', 'decoded', 'parsed', 'middlewares_in', 'validated', 'handled', 'returned']
+_REQUEST = _CALL + ['middlewares_out', 'serialized']
+
+
+@fixture
+def reports():
+    return []
+
+
+@fixture
+def stream_requests():
+    return False
+
+
+@fixture
+def app(reports: List[Tuple[str, str, List[str]]], stream_requests: bool):
+    def sink(transport: Transports, incoming: Incoming, timings: Timings):
+        stamps = [t for _, t in timings]
+        assert stamps == sorted(stamps)
+        reports.append((transport.name, incoming.method, [stage for stage, _ in timings]))
+
+        if incoming.method == 'explode':
+            raise ValueError("Sink failed")
+
+    app_ = Sanic('sanic-jsonrpc')
+    jsonrpc = SanicJsonrpc(app_, '/post', '/ws', stream_requests=stream_requests, timings_sink=sink)
+
+    @jsonrpc
+    def add(a: int, b: int) -> int:
+        return a + b
+
+    @jsonrpc
+    async def wait() -> bool:
+        await sleep(0.01)
+        return True
+
+    @jsonrpc(executor_=ThreadExecutor(1))
+    def threaded(a: int) -> int:
+        return a * 2
+
+    @jsonrpc
+    def explode() -> int:
+        return 1
+
+    return app_
+
+
+@fixture
+def test_cli(loop, app, sanic_client):
+    return loop.run_until_complete(sanic_client(app))
+
+
+@fixture
+def test_cli_ws(loop, app, sanic_client):
+    return loop.run_until_complete(sanic_client(app, scheme='ws', protocol=WebSocketProtocol))
+
+
+@mark.parametrize('stream_requests', [False, True])
+async def test_post(caplog, test_cli, reports: list):
+    caplog.set_level(DEBUG)
+    response = await test_cli.post('/post', json=[
+        {'jsonrpc': '2.0', 'method': 'add', 'params': [1, 2], 'id': 1},
+        {'jsonrpc': '2.0', 'method': 'add', 'params': [1, 'x'], 'id': 2},
+        {'jsonrpc': '2.0', 'method': 'wait'},
+        {'jsonrpc': '2.0', 'method': 'explode', 'id': 3},
+    ])
+    data = response.json()
+    data = (await data) if iscoroutine(data) else data
+
+    assert sorted(data, key=lambda d: d['id']) == [
+        {'jsonrpc': '2.0', 'result': 3, 'id': 1},
+        {'jsonrpc': '2.0', 'error': {'code': -32602, 'message': "Invalid params"}, 'id': 2},
+        {'jsonrpc': '2.0', 'result': 1, 'id': 3},
+    ]
+    await sleep(0.05)
+    assert sorted(reports) == sorted([
+        ('post', 'add', _REQUEST),
+        ('post', 'add', ['received', 'decoded', 'parsed', 'middlewares_in', 'middlewares_out', 'serialized']),
+        ('post', 'explode', _REQUEST),
+        ('post', 'wait', _CALL),
+    ])
+    assert "Timings sink failed" in caplog.text
+
+
+async def test_ws(caplog, test_cli_ws, reports: list):
+    caplog.set_level(DEBUG)
+    ws = await test_cli_ws.ws_connect('/ws')
+
+    for i in range(2):
+        await ws.send(dumps({'jsonrpc': '2.0', 'method': 'add', 'params': [i, 2], 'id': i}))
+        assert loads(await ws.recv()) == {'jsonrpc': '2.0', 'result': i + 2, 'id': i}
+
+    await ws.send(dumps({'jsonrpc': '2.0', 'method': 'threaded', 'params': [3], 'id': 2}))
+    assert loads(await ws.recv()) == {'jsonrpc': '2.0', 'result': 6, 'id': 2}
+
+    assert reports == [('ws', 'add', _REQUEST), ('ws', 'add', _REQUEST), ('ws', 'threaded', _REQUEST)]
+
+    await ws.close()
+    await test_cli_ws.close()
+